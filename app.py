@@ -153,6 +153,8 @@ if 'review_running' not in st.session_state:
     st.session_state.review_running = False
 if 'current_results' not in st.session_state:
     st.session_state.current_results = None
+if 'analyzer' not in st.session_state:
+    st.session_state.analyzer = None  # Built on the first run, then reused so agents aren't rebuilt
 
 # Header
 st.markdown('<div class="main-header">🔍 Code Review Crew</div>', unsafe_allow_html=True)
@@ -278,10 +280,13 @@ def process_payment(amount, card_number):
             else:
                 st.session_state.current_code = code_input 
                 
+                if st.session_state.analyzer is None:
+                    st.session_state.analyzer = UnifiedCodeAnalyzer()
+                analyzer = st.session_state.analyzer
+                
                 if analysis_mode == "Review Only":
                     with st.spinner("🤖 Analyzing..."):
                         try:
-                            analyzer = UnifiedCodeAnalyzer()
                             results = analyzer.review_only(code_input)
                             st.session_state.current_results = results
                             st.success("✅ Done!")
@@ -290,7 +295,6 @@ def process_payment(amount, card_number):
                 else:
                     with st.spinner("🔥 Reviewing and fixing..."):
                         try:
-                            analyzer = UnifiedCodeAnalyzer()
                             results = analyzer.review_and_fix(code_input, max_fix_iterations)
                             st.session_state.current_results = results
                             if results.get('success'):
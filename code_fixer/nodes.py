@@ -329,17 +329,18 @@ class FixerNodes:
         try:
             import openai
             
-            # Construct prompt
-            prompt = f"""Fix this code issue:
-
-Issue: {issue.get('description', 'Unknown issue')}
-Severity: {issue.get('severity', 'Unknown')}
-
-Code:
+            # Construct prompt; the code goes before the issue, so calls for different
+            # issues in the same code share a prefix the provider can cache
+            prompt = f"""Code:
 ```python
 {code}
 ```
 
+Fix this code issue:
+
+Issue: {issue.get('description', 'Unknown issue')}
+Severity: {issue.get('severity', 'Unknown')}
+
 Return ONLY the fixed code, no explanations."""
             
             logger.debug(f"         Calling {self.llm_config.get('model', 'gpt-4')}...")
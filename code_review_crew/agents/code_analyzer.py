@@ -6,6 +6,7 @@ Uses Pylint and other linting tools to provide comprehensive code analysis.
 """
 
 import autogen
+import inspect
 import re
 from typing import Dict, List, Optional
 from .base_agent import BaseAgent
@@ -33,7 +34,7 @@ class CodeAnalyzer(BaseAgent):
         self.tools = tools
         self.llm_config = llm_config
         
-        system_message = """
+        system_message = inspect.cleandoc("""
         You are a Code Analyzer specializing in Python code quality.
         
         Your responsibilities:
@@ -61,7 +62,7 @@ class CodeAnalyzer(BaseAgent):
         - Do NOT tell the orchestrator what to do next
         - Do NOT call other agents
         - Focus only on code quality issues
-        """
+        """)
         
         self.agent = autogen.AssistantAgent(
             name="CodeAnalyzer",
@@ -162,9 +163,11 @@ class CodeAnalyzer(BaseAgent):
         Returns:
             Comprehensive analysis results
         """
+        lint_results = self.tools['linting'].run_all(code)
+        
         results = {
-            'pylint_results': self.tools['linting'].run_pylint(code),
-            'pep8_results': self.tools['linting'].check_pep8(code),
+            'pylint_results': lint_results['pylint'],
+            'pep8_results': lint_results['pep8'],
             'code_smells': self.detect_code_smells(code)
         }
         
@@ -5,6 +5,7 @@ Specialized agent for safely executing code and running tests in Docker sandbox.
 """
 
 import autogen
+import inspect
 import subprocess
 import tempfile
 import os
@@ -33,7 +34,7 @@ class CodeExecutor(BaseAgent):
         self.llm_config = llm_config
         self.docker_available = self._check_docker()
         
-        system_message = """
+        system_message = inspect.cleandoc("""
         You are a Code Executor specializing in safely running code and tests.
         
         Your responsibilities:
@@ -58,7 +59,7 @@ class CodeExecutor(BaseAgent):
         - Errors encountered
         - Execution time
         - Resource usage
-        """
+        """)
         
         # For code execution, use UserProxyAgent instead of AssistantAgent
         self.agent = autogen.UserProxyAgent(
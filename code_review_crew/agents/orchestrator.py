@@ -5,6 +5,7 @@ Coordinates the code review process and synthesizes feedback from all agents.
 """
 
 import autogen
+import inspect
 from typing import Dict
 from .base_agent import BaseAgent
 
@@ -27,16 +28,12 @@ class ReviewOrchestrator(BaseAgent):
         """
         self.llm_config = llm_config
         
-        system_message = """
-        You are the Review Orchestrator coordinating the code review process.
+        system_message = inspect.cleandoc("""
+        You are the Review Orchestrator for the code review process.
         
-        YOU ARE IN CHARGE. Follow this EXACT process:
-        
-        1. Say: "CodeAnalyzer, please analyze this code for quality issues."
-        2. After CodeAnalyzer responds, say: "SecurityReviewer, please check for security vulnerabilities."
-        3. After SecurityReviewer responds, say: "PerformanceOptimizer, please analyze performance."
-        4. After PerformanceOptimizer responds, say: "TestGenerator, please suggest test cases for this code."
-        5. After all agents respond, synthesize everything into a final report.
+        CodeAnalyzer, SecurityReviewer, PerformanceOptimizer and TestGenerator
+        report on the code first, in that order. You speak last, once all of
+        them have responded: synthesize everything into a final report.
         
         Final Report Structure:
         - Overall Grade (A-F scale)
@@ -48,14 +45,10 @@ class ReviewOrchestrator(BaseAgent):
         - Action Items
         
         IMPORTANT: 
-        - You decide who speaks next, not the other agents
-        - Call ALL agents in order: CodeAnalyzer → SecurityReviewer → PerformanceOptimizer → TestGenerator
-        - Each agent only speaks ONCE unless you ask for clarification
+        - Do NOT ask other agents to speak; the speaking order is fixed
         - Keep the review focused and organized
         - Provide actionable feedback
-        
-        Note: CodeExecutor is available if you need to verify a fix, but is optional.
-        """
+        """)
         
         self.agent = autogen.AssistantAgent(
             name="ReviewOrchestrator",
@@ -5,6 +5,7 @@ Specialized agent for analyzing performance and optimization opportunities.
 """
 
 import autogen
+import inspect
 import re
 from typing import Dict, List
 from .base_agent import BaseAgent
@@ -30,7 +31,7 @@ class PerformanceOptimizer(BaseAgent):
         self.tools = tools
         self.llm_config = llm_config
         
-        system_message = """
+        system_message = inspect.cleandoc("""
         You are a Performance Optimizer specializing in code performance analysis.
         
         Your responsibilities:
@@ -54,7 +55,7 @@ class PerformanceOptimizer(BaseAgent):
         - Suggested optimization
         - Expected improvement
         - Code example
-        """
+        """)
         
         self.agent = autogen.AssistantAgent(
             name="PerformanceOptimizer",
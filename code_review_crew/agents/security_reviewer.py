@@ -5,6 +5,7 @@ Specialized agent for identifying security vulnerabilities and best practices.
 """
 
 import autogen
+import inspect
 import re
 from typing import Dict, List
 from .base_agent import BaseAgent
@@ -32,7 +33,7 @@ class SecurityReviewer(BaseAgent):
         self.tools = tools
         self.llm_config = llm_config
         
-        system_message = """
+        system_message = inspect.cleandoc("""
         You are a Security Reviewer specializing in identifying security vulnerabilities.
         
         Your responsibilities:
@@ -58,7 +59,7 @@ class SecurityReviewer(BaseAgent):
         - Vulnerability type
         - Exploit example
         - Secure fix
-        """
+        """)
         
         self.agent = autogen.AssistantAgent(
             name="SecurityReviewer",
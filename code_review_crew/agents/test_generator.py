@@ -5,6 +5,7 @@ Specialized agent for generating unit tests and test cases.
 """
 
 import autogen
+import inspect
 import re
 from typing import Dict, List
 from .base_agent import BaseAgent
@@ -30,7 +31,7 @@ class TestGenerator(BaseAgent):
         self.tools = tools or {}
         self.llm_config = llm_config
         
-        system_message = """
+        system_message = inspect.cleandoc("""
         You are a Test Generator specializing in creating comprehensive unit tests.
         
         Your responsibilities:
@@ -65,7 +66,7 @@ class TestGenerator(BaseAgent):
         - Provide complete test suggestions
         - Do NOT tell the orchestrator what to do next
         - Focus only on test recommendations
-        """
+        """)
         
         self.agent = autogen.AssistantAgent(
             name="TestGenerator",
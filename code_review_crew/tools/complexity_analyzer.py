@@ -12,11 +12,26 @@ import os
 from typing import Dict, List
 
 
+# Keep temporary source files in RAM where a tmpfs is available (Linux)
+TEMP_CODE_DIR = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
+
 class ComplexityAnalyzer:
     """Wrapper for Radon complexity analysis tool"""
     
-    def __init__(self):
-        self.temp_dir = tempfile.gettempdir()
+    def _write_temp_code(self, code: str) -> str:
+        """
+        Write code to a new temporary .py file for Radon
+        
+        Each call gets its own file so concurrent analyses can't overwrite
+        each other's input. The caller removes the file.
+        
+        Returns:
+            Path to the temporary file
+        """
+        with tempfile.NamedTemporaryFile('w', suffix='.py', dir=TEMP_CODE_DIR, delete=False) as f:
+            f.write(code)
+            return f.name
     
     def calculate_complexity(self, code: str) -> Dict:
         """
@@ -42,9 +57,7 @@ class ComplexityAnalyzer:
             }
         """
         # Write code to temporary file
-        temp_file = os.path.join(self.temp_dir, 'temp_code.py')
-        with open(temp_file, 'w') as f:
-            f.write(code)
+        temp_file = self._write_temp_code(code)
         
         try:
             # Run radon cc (cyclomatic complexity)
@@ -295,9 +308,7 @@ class ComplexityAnalyzer:
         Returns:
             Dictionary of Halstead metrics
         """
-        temp_file = os.path.join(self.temp_dir, 'temp_code.py')
-        with open(temp_file, 'w') as f:
-            f.write(code)
+        temp_file = self._write_temp_code(code)
         
         try:
             result = subprocess.run(
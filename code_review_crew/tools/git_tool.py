@@ -7,7 +7,19 @@ Useful for reviewing code changes in pull requests.
 
 import subprocess
 import re
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Literal
+
+
+# File path fragments that mark a change as high risk (matched case-sensitively)
+SENSITIVE_FILE_PATTERNS = ('auth', 'security', 'payment', 'database')
+
+# File path fragments that call for a security-focused review (matched on lowercased paths)
+SECURITY_FILE_PATTERNS = ('auth', 'password', 'token', 'secret', 'key', 'sql', 'query')
+
+# A file's "--- old" / "+++ new" header pair: it directly follows a git extended header line
+# (index, new file mode, ...), unlike changed lines, which follow other hunk lines
+_FILE_HEADER_RE = re.compile(r'^[A-Za-z][^\n]*\n--- [^\n]*\n\+\+\+ ', re.MULTILINE)
 
 
 class GitTool:
@@ -15,13 +27,22 @@ class GitTool:
     
     def __init__(self):
         self.diff_pattern = re.compile(r'^@@\s+-(\d+),?(\d*)\s+\+(\d+),?(\d*)\s+@@')
+        self._parse_cache = OrderedDict()
+        self._parse_cache_size = 8
     
-    def parse_diff(self, diff_text: str) -> Dict:
+    # How much of the diff structure each parse_diff detail level builds
+    _DETAIL_RANK = {'paths': 0, 'stats': 1, 'full': 2}
+    
+    def parse_diff(self, diff_text: str, detail: Literal['full', 'stats', 'paths'] = 'full') -> Dict:
         """
         Parse a Git diff into structured format
         
         Args:
             diff_text: Git diff output
+            detail: How much structure to build. 'full' builds everything;
+                    'stats' skips the per-line 'changes' lists; 'paths' also
+                    skips chunk headers, leaving 'chunks' empty. File paths and
+                    'stats' are always filled in.
         
         Returns:
             {
@@ -47,6 +68,16 @@ class GitTool:
         files = []
         current_file = None
         current_chunk = None
+        in_chunk = False
+        insertions = 0
+        deletions = 0
+        
+        build_chunks = detail != 'paths'
+        build_changes = detail == 'full'
+        
+        # Lines seen so far in the current chunk, on the new and old side
+        new_offset = 0
+        old_offset = 0
         
         lines = diff_text.split('\n')
         
@@ -55,6 +86,7 @@ class GitTool:
             if line.startswith('diff --git'):
                 if current_file:
                     files.append(current_file)
+                in_chunk = False
                 
                 # Extract file paths
                 match = re.search(r'a/(.+?)\s+b/(.+)', line)
@@ -66,15 +98,19 @@ class GitTool:
                         'chunks': []
                     }
             
-            # File mode/index/--- +++
-            elif line.startswith('---') or line.startswith('+++'):
+            # File mode/index/--- +++; only before the file's first hunk, since a
+            # changed line can start with the same characters (e.g. a removed "-- comment")
+            elif not in_chunk and (line.startswith('---') or line.startswith('+++')):
                 continue
             
             # Chunk header
             elif line.startswith('@@'):
-                if current_file:
+                if current_file and not build_chunks:
+                    in_chunk = True
+                elif current_file:
                     match = self.diff_pattern.match(line)
                     if match:
+                        in_chunk = True
                         old_start = int(match.group(1))
                         old_lines = int(match.group(2)) if match.group(2) else 1
                         new_start = int(match.group(3))
@@ -89,62 +125,145 @@ class GitTool:
                             'changes': []
                         }
                         current_file['chunks'].append(current_chunk)
+                        new_offset = 0
+                        old_offset = 0
             
             # Added line
-            elif line.startswith('+') and current_chunk:
-                current_chunk['changes'].append({
-                    'type': 'add',
-                    'line': line[1:],
-                    'line_number': current_chunk['new_start'] + len([c for c in current_chunk['changes'] if c['type'] in ['add', 'context']])
-                })
+            elif line.startswith('+') and in_chunk:
+                insertions += 1
+                if build_changes:
+                    current_chunk['changes'].append({
+                        'type': 'add',
+                        'line': line[1:],
+                        'line_number': current_chunk['new_start'] + new_offset
+                    })
+                    new_offset += 1
             
             # Removed line
-            elif line.startswith('-') and current_chunk:
-                current_chunk['changes'].append({
-                    'type': 'remove',
-                    'line': line[1:],
-                    'line_number': current_chunk['old_start'] + len([c for c in current_chunk['changes'] if c['type'] in ['remove', 'context']])
-                })
+            elif line.startswith('-') and in_chunk:
+                deletions += 1
+                if build_changes:
+                    current_chunk['changes'].append({
+                        'type': 'remove',
+                        'line': line[1:],
+                        'line_number': current_chunk['old_start'] + old_offset
+                    })
+                    old_offset += 1
             
             # Context line
-            elif line.startswith(' ') and current_chunk:
+            elif line.startswith(' ') and in_chunk and build_changes:
                 current_chunk['changes'].append({
                     'type': 'context',
                     'line': line[1:]
                 })
+                new_offset += 1
+                old_offset += 1
         
         # Add last file
         if current_file:
             files.append(current_file)
         
-        # Calculate stats
-        stats = self._calculate_diff_stats(files)
+        # Stats are counted while parsing rather than re-walking every change
+        stats = {
+            'files_changed': len(files),
+            'insertions': insertions,
+            'deletions': deletions,
+            'total_changes': insertions + deletions
+        }
         
         return {
             'files': files,
             'stats': stats
         }
     
-    def _calculate_diff_stats(self, files: List[Dict]) -> Dict:
-        """Calculate statistics from parsed diff"""
-        stats = {
-            'files_changed': len(files),
-            'insertions': 0,
-            'deletions': 0,
-            'total_changes': 0
+    def get_diff_stats(self, diff_text: str) -> Dict:
+        """
+        Count changed files and lines without parsing the diff
+        
+        Uses str.count over the raw text, which is much faster than parse_diff
+        for large diffs when only the totals are needed. The "---"/"+++" file
+        headers are found with _FILE_HEADER_RE and subtracted, so changed lines
+        that start with '-- ' or '++ ' (e.g. SQL comments) still count.
+        
+        Args:
+            diff_text: Git diff output
+        
+        Returns:
+            Same shape as parse_diff()['stats']
+        """
+        def count_line_prefix(prefix: str) -> int:
+            return diff_text.count('\n' + prefix) + diff_text.startswith(prefix)
+        
+        headers = len(_FILE_HEADER_RE.findall(diff_text))
+        insertions = count_line_prefix('+') - headers
+        deletions = count_line_prefix('-') - headers
+        
+        return {
+            'files_changed': count_line_prefix('diff --git '),
+            'insertions': insertions,
+            'deletions': deletions,
+            'total_changes': insertions + deletions
         }
+    
+    def _parse_cached(self, diff_text: str, detail: Literal['full', 'stats', 'paths'] = 'full') -> Dict:
+        """
+        Parse a diff, reusing the result for recently seen diff text
         
-        for file in files:
-            for chunk in file['chunks']:
-                for change in chunk['changes']:
-                    if change['type'] == 'add':
-                        stats['insertions'] += 1
-                    elif change['type'] == 'remove':
-                        stats['deletions'] += 1
+        The high-level helpers below are usually called back to back on the
+        same diff, so keeping the last few parses avoids re-scanning it each time.
+        A cached parse is reused whenever it is at least as detailed as requested.
+        Cached entries also carry 'path_classes' (see _classify_paths).
+        The returned structure is shared and must not be mutated.
+        """
+        cached = self._parse_cache.get(diff_text)
+        if cached is not None and self._DETAIL_RANK[cached['detail']] >= self._DETAIL_RANK[detail]:
+            self._parse_cache.move_to_end(diff_text)
+            return cached
+        
+        parsed = self.parse_diff(diff_text, detail=detail)
+        parsed['detail'] = detail
+        parsed['path_classes'] = self._classify_paths(parsed['files'])
+        self._parse_cache[diff_text] = parsed
+        self._parse_cache.move_to_end(diff_text)
+        if len(self._parse_cache) > self._parse_cache_size:
+            self._parse_cache.popitem(last=False)
+        
+        return parsed
+    
+    def _classify_paths(self, files: List[Dict]) -> Dict:
+        """
+        Classify changed file paths in a single scan
+        
+        Returns:
+            {
+                'sensitive': [file paths matching SENSITIVE_FILE_PATTERNS],
+                'security': [file paths matching SECURITY_FILE_PATTERNS],
+                'has_tests': bool,
+                'has_non_tests': bool
+            }
+        """
+        classes = {
+            'sensitive': [],
+            'security': [],
+            'has_tests': False,
+            'has_non_tests': False
+        }
         
-        stats['total_changes'] = stats['insertions'] + stats['deletions']
+        for file in files:
+            file_path = file['file_path']
+            file_lower = file_path.lower()
+            
+            if any(pattern in file_path for pattern in SENSITIVE_FILE_PATTERNS):
+                classes['sensitive'].append(file_path)
+            if any(pattern in file_lower for pattern in SECURITY_FILE_PATTERNS):
+                classes['security'].append(file_path)
+            
+            if 'test' in file_lower:
+                classes['has_tests'] = True
+            else:
+                classes['has_non_tests'] = True
         
-        return stats
+        return classes
     
     def get_changed_lines(self, diff_text: str) -> Dict[str, List[int]]:
         """
@@ -156,7 +275,7 @@ class GitTool:
         Returns:
             Dictionary mapping file paths to lists of changed line numbers
         """
-        parsed = self.parse_diff(diff_text)
+        parsed = self._parse_cached(diff_text)
         changed_lines = {}
         
         for file in parsed['files']:
@@ -182,7 +301,7 @@ class GitTool:
         Returns:
             Dictionary mapping file paths to added code
         """
-        parsed = self.parse_diff(diff_text)
+        parsed = self._parse_cached(diff_text)
         added_code = {}
         
         for file in parsed['files']:
@@ -274,7 +393,8 @@ class GitTool:
         Returns:
             Analysis of change complexity
         """
-        parsed = self.parse_diff(diff_text)
+        # Only totals and file paths are needed, so skip building chunks
+        parsed = self._parse_cached(diff_text, detail='paths')
         
         analysis = {
             'risk_level': 'low',
@@ -301,12 +421,10 @@ class GitTool:
             if analysis['risk_level'] == 'low':
                 analysis['risk_level'] = 'medium'
         
-        # Check for risky patterns
-        for file in parsed['files']:
-            # Modifying critical files
-            if any(pattern in file['file_path'] for pattern in ['auth', 'security', 'payment', 'database']):
-                analysis['concerns'].append(f'Modifying sensitive file: {file["file_path"]}')
-                analysis['risk_level'] = 'high'
+        # Check for risky patterns (modifying critical files)
+        for file_path in parsed['path_classes']['sensitive']:
+            analysis['concerns'].append(f'Modifying sensitive file: {file_path}')
+            analysis['risk_level'] = 'high'
         
         return analysis
     
@@ -320,15 +438,14 @@ class GitTool:
         Returns:
             List of review focus suggestions
         """
-        parsed = self.parse_diff(diff_text)
+        # Only totals and file paths are needed, so skip building chunks
+        parsed = self._parse_cached(diff_text, detail='paths')
+        path_classes = parsed['path_classes']
         suggestions = []
         
         # Check for security-sensitive changes
-        security_patterns = ['auth', 'password', 'token', 'secret', 'key', 'sql', 'query']
-        for file in parsed['files']:
-            file_lower = file['file_path'].lower()
-            if any(pattern in file_lower for pattern in security_patterns):
-                suggestions.append(f'Security review needed for {file["file_path"]}')
+        for file_path in path_classes['security']:
+            suggestions.append(f'Security review needed for {file_path}')
         
         # Check for large changes
         if parsed['stats']['total_changes'] > 200:
@@ -339,10 +456,7 @@ class GitTool:
             suggestions.append('Significant code deletion - verify removed code is truly unused')
         
         # Check for test files
-        test_files = [f for f in parsed['files'] if 'test' in f['file_path'].lower()]
-        non_test_files = [f for f in parsed['files'] if 'test' not in f['file_path'].lower()]
-        
-        if non_test_files and not test_files:
+        if path_classes['has_non_tests'] and not path_classes['has_tests']:
             suggestions.append('No test changes detected - consider adding tests')
         
         return suggestions
\ No newline at end of file
@@ -9,15 +9,34 @@ import subprocess
 import json
 import tempfile
 import os
-from typing import Dict, List
+import tokenize
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from io import StringIO
+from typing import Dict, List, Tuple
+
+try:
+    from pylint.lint import Run as PylintRun
+    from pylint.reporters.json_reporter import JSONReporter
+    PYLINT_AVAILABLE = True
+except ImportError:
+    PYLINT_AVAILABLE = False
+
+# Seconds a Pylint run may take, in-process or as a subprocess
+PYLINT_TIMEOUT = 30
+
+# In-process Pylint runs all happen on this one thread: the linter and astroid's global
+# state aren't thread-safe, and a run that hangs can be abandoned after PYLINT_TIMEOUT
+_pylint_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pylint")
+
+# Linter configured by the first in-process run and reused by the later ones, so
+# checkers and options are set up once (only used on _pylint_executor's thread)
+_pylinter = None
 
 
 class LintingTool:
     """Wrapper for Python linting tools (Pylint, pycodestyle)"""
     
-    def __init__(self):
-        self.temp_dir = tempfile.gettempdir()
-    
     def run_pylint(self, code: str) -> Dict:
         """
         Run Pylint on code and return structured results
@@ -42,66 +61,101 @@ class LintingTool:
                 'statistics': dict
             }
         """
-        # Write code to temporary file
-        temp_file = os.path.join(self.temp_dir, 'temp_code.py')
-        with open(temp_file, 'w') as f:
-            f.write(code)
-        
-        try:
-            # Run pylint with JSON output
-            result = subprocess.run(
-                ['pylint', temp_file, '--output-format=json', '--score=yes'],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            # Parse JSON output
-            issues = []
-            if result.stdout:
-                try:
-                    issues = json.loads(result.stdout)
-                except json.JSONDecodeError:
-                    pass
-            
-            # Calculate score from stderr (pylint prints score there)
-            score = self._extract_score(result.stderr)
-            
-            # Format issues
-            formatted_issues = self._format_pylint_issues(issues)
+        # Write code to a per-call temporary directory so concurrent calls never
+        # share a path (astroid also caches modules by path and would return
+        # the previous call's AST for a reused file)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_file = os.path.join(temp_dir, 'temp_code.py')
+            with open(temp_file, 'w') as f:
+                f.write(code)
             
-            # Generate summary
-            summary = self._generate_summary(score, formatted_issues)
-            
-            # Get statistics
-            statistics = self._calculate_statistics(formatted_issues)
+            try:
+                if PYLINT_AVAILABLE:
+                    issues, score, raw_output = self._run_pylint_in_process(temp_file)
+                else:
+                    issues, score, raw_output = self._run_pylint_subprocess(temp_file)
+                
+                # Format issues
+                formatted_issues = self._format_pylint_issues(issues)
+                
+                # Get statistics
+                statistics = self._calculate_statistics(formatted_issues)
+                
+                # Generate summary
+                summary = self._generate_summary(score, statistics)
+                
+                return {
+                    'score': score,
+                    'issues': formatted_issues,
+                    'summary': summary,
+                    'statistics': statistics,
+                    'raw_output': raw_output
+                }
             
-            return {
-                'score': score,
-                'issues': formatted_issues,
-                'summary': summary,
-                'statistics': statistics,
-                'raw_output': result.stderr
-            }
+            except subprocess.TimeoutExpired:
+                return {
+                    'score': 0,
+                    'issues': [],
+                    'summary': 'Pylint timeout',
+                    'error': 'Analysis timed out'
+                }
+            except Exception as e:
+                return {
+                    'score': 0,
+                    'issues': [],
+                    'summary': f'Pylint error: {str(e)}',
+                    'error': str(e)
+                }
+    
+    def _run_pylint_in_process(self, file_path: str) -> Tuple[List[Dict], float, str]:
+        """
+        Run Pylint through its Python API
         
-        except subprocess.TimeoutExpired:
-            return {
-                'score': 0,
-                'issues': [],
-                'summary': 'Pylint timeout',
-                'error': 'Analysis timed out'
-            }
-        except Exception as e:
-            return {
-                'score': 0,
-                'issues': [],
-                'summary': f'Pylint error: {str(e)}',
-                'error': str(e)
-            }
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+        Avoids spawning a new interpreter and re-importing Pylint/astroid on
+        every call; the linter, its checkers and astroid's inference caches are
+        reused between runs.
+        
+        Raises:
+            subprocess.TimeoutExpired: The run took longer than PYLINT_TIMEOUT; it
+                can't be interrupted, so later runs wait behind it until it ends
+        """
+        future = _pylint_executor.submit(_lint_in_process, file_path)
+        try:
+            raw_output, score = future.result(timeout=PYLINT_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            raise subprocess.TimeoutExpired('pylint', PYLINT_TIMEOUT)
+        
+        issues = []
+        if raw_output.strip():
+            try:
+                issues = json.loads(raw_output)
+            except json.JSONDecodeError:
+                pass
+        
+        return issues, score, raw_output
+    
+    def _run_pylint_subprocess(self, file_path: str) -> Tuple[List[Dict], float, str]:
+        """Run Pylint as an external command (fallback when it can't be imported)"""
+        result = subprocess.run(
+            ['pylint', file_path, '--output-format=json', '--score=yes'],
+            capture_output=True,
+            text=True,
+            timeout=PYLINT_TIMEOUT
+        )
+        
+        # Parse JSON output
+        issues = []
+        if result.stdout:
+            try:
+                issues = json.loads(result.stdout)
+            except json.JSONDecodeError:
+                pass
+        
+        # Calculate score from stderr (pylint prints score there)
+        score = self._extract_score(result.stderr)
+        
+        return issues, score, result.stderr
     
     def _extract_score(self, stderr: str) -> float:
         """Extract Pylint score from stderr output"""
@@ -142,7 +196,7 @@ class LintingTool:
         }
         return mapping.get(issue_type, 'low')
     
-    def _generate_summary(self, score: float, issues: List[Dict]) -> str:
+    def _generate_summary(self, score: float, statistics: Dict) -> str:
         """Generate human-readable summary"""
         if score >= 9.0:
             quality = "Excellent"
@@ -155,38 +209,24 @@ class LintingTool:
         else:
             quality = "Poor"
         
-        error_count = len([i for i in issues if i['type'] == 'error'])
-        warning_count = len([i for i in issues if i['type'] == 'warning'])
+        error_count = statistics['by_type'].get('error', 0)
+        warning_count = statistics['by_type'].get('warning', 0)
+        other_count = statistics['total_issues'] - error_count - warning_count
         
         summary = f"Pylint Score: {score}/10 ({quality}). "
         summary += f"Found {error_count} errors, {warning_count} warnings, "
-        summary += f"and {len(issues) - error_count - warning_count} other issues."
+        summary += f"and {other_count} other issues."
         
         return summary
     
     def _calculate_statistics(self, issues: List[Dict]) -> Dict:
         """Calculate statistics from issues"""
-        stats = {
+        return {
             'total_issues': len(issues),
-            'by_type': {},
-            'by_severity': {},
-            'by_category': {}
+            'by_type': dict(Counter(issue['type'] for issue in issues)),
+            'by_severity': dict(Counter(issue['severity'] for issue in issues)),
+            'by_category': dict(Counter(issue['category'] for issue in issues))
         }
-        
-        for issue in issues:
-            # Count by type
-            issue_type = issue['type']
-            stats['by_type'][issue_type] = stats['by_type'].get(issue_type, 0) + 1
-            
-            # Count by severity
-            severity = issue['severity']
-            stats['by_severity'][severity] = stats['by_severity'].get(severity, 0) + 1
-            
-            # Count by category
-            category = issue['category']
-            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-        
-        return stats
     
     def check_pep8(self, code: str) -> List[Dict]:
         """
@@ -198,15 +238,11 @@ class LintingTool:
         Returns:
             List of PEP 8 violations
         """
-        # Write code to temporary file
-        temp_file = os.path.join(self.temp_dir, 'temp_code.py')
-        with open(temp_file, 'w') as f:
-            f.write(code)
-        
         try:
-            # Run pycodestyle
+            # Run pycodestyle, feeding the code over stdin
             result = subprocess.run(
-                ['pycodestyle', temp_file],
+                ['pycodestyle', '-'],
+                input=code,
                 capture_output=True,
                 text=True,
                 timeout=30
@@ -214,8 +250,8 @@ class LintingTool:
             
             # Parse output
             violations = []
-            for line in result.stdout.split('\n'):
-                if line.strip():
+            for line in result.stdout.splitlines():
+                if line:
                     violation = self._parse_pep8_line(line)
                     if violation:
                         violations.append(violation)
@@ -237,9 +273,28 @@ class LintingTool:
                 'message': f'PEP 8 check error: {str(e)}',
                 'error': True
             }]
-        finally:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+    
+    def run_all(self, code: str) -> Dict:
+        """
+        Run Pylint and the PEP 8 check concurrently
+        
+        Args:
+            code: Python source code to analyze
+        
+        Returns:
+            {
+                'pylint': run_pylint() result,
+                'pep8': check_pep8() result
+            }
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pylint_future = executor.submit(self.run_pylint, code)
+            pep8_future = executor.submit(self.check_pep8, code)
+            
+            return {
+                'pylint': pylint_future.result(),
+                'pep8': pep8_future.result()
+            }
     
     def _parse_pep8_line(self, line: str) -> Dict:
         """Parse a pycodestyle output line"""
@@ -247,11 +302,12 @@ class LintingTool:
             # Format: filename:line:column: code message
             parts = line.split(':', 3)
             if len(parts) >= 4:
+                code, _, message = parts[3].strip().partition(' ')
                 return {
                     'line': int(parts[1]),
                     'column': int(parts[2]),
-                    'code': parts[3].split()[0],
-                    'message': ' '.join(parts[3].split()[1:]),
+                    'code': code,
+                    'message': message.strip(),
                     'severity': 'low'
                 }
         except:
@@ -278,24 +334,90 @@ class LintingTool:
             'docstring_lines': 0
         }
         
-        in_docstring = False
-        for line in lines:
-            stripped = line.strip()
+        try:
+            line_kinds = self._classify_lines(code)
+        except (tokenize.TokenError, SyntaxError):
+            # Code that can't be tokenized: fall back to a plain line scan
+            line_kinds = {}
+            for line_no, line in enumerate(lines, 1):
+                stripped = line.strip()
+                if stripped.startswith('#'):
+                    line_kinds[line_no] = 'comment'
+                elif stripped:
+                    line_kinds[line_no] = 'code'
+        
+        for line_no in range(1, len(lines) + 1):
+            kind = line_kinds.get(line_no, 'blank')
+            metrics[f'{kind}_lines'] += 1
+        
+        return metrics
+    
+    def _classify_lines(self, code: str) -> Dict[int, str]:
+        """
+        Classify source lines as 'code', 'comment' or 'docstring' in one tokenize pass
+        
+        A docstring is a string literal that forms a whole statement on its own.
+        Lines missing from the result are blank.
+        """
+        kinds = {}
+        pending_string = None
+        prev_type = tokenize.NEWLINE
+        
+        for token in tokenize.generate_tokens(StringIO(code).readline):
+            token_type = token.type
             
-            # Check for docstrings
-            if '"""' in stripped or "'''" in stripped:
-                in_docstring = not in_docstring
-                metrics['docstring_lines'] += 1
-            elif in_docstring:
-                metrics['docstring_lines'] += 1
-            # Check for comments
-            elif stripped.startswith('#'):
-                metrics['comment_lines'] += 1
-            # Check for blank lines
-            elif not stripped:
-                metrics['blank_lines'] += 1
-            # Otherwise it's a code line
+            if token_type in (tokenize.NL, tokenize.INDENT, tokenize.DEDENT, tokenize.ENDMARKER):
+                continue
+            
+            if token_type == tokenize.COMMENT:
+                kinds.setdefault(token.start[0], 'comment')
+                continue
+            
+            if token_type == tokenize.NEWLINE:
+                if pending_string is not None:
+                    for line_no in range(pending_string.start[0], pending_string.end[0] + 1):
+                        kinds[line_no] = 'docstring'
+                    pending_string = None
+                prev_type = token_type
+                continue
+            
+            if token_type == tokenize.STRING and prev_type == tokenize.NEWLINE:
+                # Might be a docstring; decided once the statement ends
+                pending_string = token
             else:
-                metrics['code_lines'] += 1
+                if pending_string is not None:
+                    for line_no in range(pending_string.start[0], pending_string.end[0] + 1):
+                        kinds[line_no] = 'code'
+                    pending_string = None
+                for line_no in range(token.start[0], token.end[0] + 1):
+                    kinds[line_no] = 'code'
+            
+            prev_type = token_type
         
-        return metrics
\ No newline at end of file
+        return kinds
+
+
+def _lint_in_process(file_path: str) -> Tuple[str, float]:
+    """
+    Lint one file with the shared linter; runs on _pylint_executor's thread
+    
+    Returns:
+        JSON reporter output and the file's score
+    """
+    global _pylinter
+    output = StringIO()
+    
+    if _pylinter is None:
+        run = PylintRun(
+            [file_path, '--score=yes', '--persistent=n'],
+            reporter=JSONReporter(output),
+            exit=False
+        )
+        _pylinter = run.linter
+    else:
+        _pylinter.set_reporter(JSONReporter(output))
+        _pylinter.check([file_path])
+        _pylinter.generate_reports()
+    
+    score = getattr(_pylinter.stats, 'global_note', 0.0) or 0.0
+    return output.getvalue(), float(score)
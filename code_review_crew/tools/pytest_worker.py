@@ -0,0 +1,75 @@
+"""
+Pytest Worker
+
+Long-lived helper process for TestRunner. Imports pytest and its plugins
+once, then forks a fresh child for every run, so each run starts from a
+clean copy of a warm interpreter instead of a new pytest process.
+
+Protocol: one JSON request per line on stdin
+({"args": [...], "cwd": ..., "stdout": path, "stderr": path}) and one JSON
+reply per line on stdout ({"returncode": n}). POSIX only, since it forks.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+
+def _preload_plugins():
+    """Import installed pytest plugins up front so forked runs don't re-import them"""
+    try:
+        from importlib.metadata import entry_points
+        plugins = entry_points(group='pytest11')
+    except Exception:
+        return
+    
+    for plugin in plugins:
+        try:
+            plugin.load()
+        except Exception:
+            pass
+
+
+def _run_child(request: dict):
+    """Run one pytest session in the forked child and exit with its code"""
+    returncode = 1
+    
+    try:
+        # Tests must not read the request pipe or write into the reply pipe
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        for fd, path in ((1, request['stdout']), (2, request['stderr'])):
+            out = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.dup2(out, fd)
+            os.close(out)
+        
+        os.chdir(request['cwd'])
+        returncode = int(pytest.main(request['args']))
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(returncode)
+
+
+def main():
+    """Serve pytest runs read from stdin until it closes"""
+    _preload_plugins()
+    
+    for line in sys.stdin:
+        request = json.loads(line)
+        
+        pid = os.fork()
+        if pid == 0:
+            _run_child(request)
+        
+        _, status = os.waitpid(pid, 0)
+        sys.stdout.write(json.dumps({'returncode': os.waitstatus_to_exitcode(status)}) + '\n')
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    # Started by file path; keep the tools directory off the tests' import path
+    sys.path.pop(0)
+    main()
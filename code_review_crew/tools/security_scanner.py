@@ -6,9 +6,155 @@ Wrapper for Bandit security scanner to identify security vulnerabilities in Pyth
 
 import subprocess
 import json
-import tempfile
+import re
+import asyncio
+import atexit
+import logging
+import hashlib
+import linecache
+import multiprocessing
 import os
-from typing import Dict, List
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    from bandit.core import config as bandit_config
+    from bandit.core import manager as bandit_manager
+    BANDIT_AVAILABLE = True
+    
+    # Bandit warns on every scan of a temp file that it isn't in a package
+    logging.getLogger('bandit.core.node_visitor').setLevel(logging.ERROR)
+except ImportError:
+    BANDIT_AVAILABLE = False
+
+
+# Patterns for common secrets: (pattern, type, only matches a quoted assignment)
+SECRET_PATTERNS = [
+    (re.compile(r'password\s*=\s*["\'][^"\']+["\']', re.IGNORECASE), 'Password', True),
+    (re.compile(r'api[_-]?key\s*=\s*["\'][^"\']+["\']', re.IGNORECASE), 'API Key', True),
+    (re.compile(r'secret\s*=\s*["\'][^"\']+["\']', re.IGNORECASE), 'Secret', True),
+    (re.compile(r'token\s*=\s*["\'][^"\']+["\']', re.IGNORECASE), 'Token', True),
+    (re.compile(r'(aws|amazon)[_-]?secret', re.IGNORECASE), 'AWS Secret', False),
+    (re.compile(r'private[_-]?key', re.IGNORECASE), 'Private Key', False),
+]
+
+# All secret patterns fused into one alternation, so most lines need a single search
+SECRETS_RE = re.compile(
+    '|'.join(f'(?:{pattern.pattern})' for pattern, _, _ in SECRET_PATTERNS),
+    re.IGNORECASE
+)
+
+# Bandit test IDs and the OWASP Top 10 (2021) category of the weakness they detect
+BANDIT_ID_TO_OWASP = {
+    # Broken access control
+    'B103': 'A01:2021 - Broken Access Control',      # set_bad_file_permissions
+    'B202': 'A01:2021 - Broken Access Control',      # tarfile_unsafe_members
+    # Cryptographic failures
+    'B303': 'A02:2021 - Cryptographic Failures',     # md5 / sha1
+    'B304': 'A02:2021 - Cryptographic Failures',     # insecure ciphers
+    'B305': 'A02:2021 - Cryptographic Failures',     # insecure cipher modes
+    'B311': 'A02:2021 - Cryptographic Failures',     # random for security
+    'B312': 'A02:2021 - Cryptographic Failures',     # telnetlib
+    'B321': 'A02:2021 - Cryptographic Failures',     # ftplib
+    'B323': 'A02:2021 - Cryptographic Failures',     # unverified SSL context
+    'B324': 'A02:2021 - Cryptographic Failures',     # weak hashlib hash
+    'B401': 'A02:2021 - Cryptographic Failures',     # import telnetlib
+    'B402': 'A02:2021 - Cryptographic Failures',     # import ftplib
+    'B502': 'A02:2021 - Cryptographic Failures',     # ssl with bad version
+    'B503': 'A02:2021 - Cryptographic Failures',     # ssl with bad defaults
+    'B504': 'A02:2021 - Cryptographic Failures',     # ssl with no version
+    'B505': 'A02:2021 - Cryptographic Failures',     # weak cryptographic key
+    'B508': 'A02:2021 - Cryptographic Failures',     # insecure SNMP version
+    'B509': 'A02:2021 - Cryptographic Failures',     # weak SNMP cryptography
+    # Injection
+    'B102': 'A03:2021 - Injection',                  # exec
+    'B307': 'A03:2021 - Injection',                  # eval
+    'B308': 'A03:2021 - Injection',                  # mark_safe
+    'B404': 'A03:2021 - Injection',                  # import subprocess
+    'B601': 'A03:2021 - Injection',                  # paramiko exec_command
+    'B602': 'A03:2021 - Injection',                  # subprocess with shell=True
+    'B603': 'A03:2021 - Injection',                  # subprocess without shell
+    'B604': 'A03:2021 - Injection',                  # any call with shell=True
+    'B605': 'A03:2021 - Injection',                  # process started with a shell
+    'B606': 'A03:2021 - Injection',                  # process started without a shell
+    'B607': 'A03:2021 - Injection',                  # partial executable path
+    'B608': 'A03:2021 - Injection',                  # SQL built from strings
+    'B609': 'A03:2021 - Injection',                  # wildcard injection
+    'B610': 'A03:2021 - Injection',                  # Django extra()
+    'B611': 'A03:2021 - Injection',                  # Django RawSQL
+    'B701': 'A03:2021 - Injection',                  # jinja2 autoescape off
+    'B702': 'A03:2021 - Injection',                  # Mako templates
+    'B703': 'A03:2021 - Injection',                  # Django mark_safe
+    'B704': 'A03:2021 - Injection',                  # markupsafe Markup
+    # Security misconfiguration
+    'B101': 'A05:2021 - Security Misconfiguration',  # assert
+    'B104': 'A05:2021 - Security Misconfiguration',  # bind to all interfaces
+    'B108': 'A05:2021 - Security Misconfiguration',  # hardcoded tmp directory
+    'B201': 'A05:2021 - Security Misconfiguration',  # Flask debug=True
+    'B306': 'A05:2021 - Security Misconfiguration',  # mktemp
+    'B313': 'A05:2021 - Security Misconfiguration',  # XML parsing (B313-B320, B405-B411)
+    'B314': 'A05:2021 - Security Misconfiguration',
+    'B315': 'A05:2021 - Security Misconfiguration',
+    'B316': 'A05:2021 - Security Misconfiguration',
+    'B317': 'A05:2021 - Security Misconfiguration',
+    'B318': 'A05:2021 - Security Misconfiguration',
+    'B319': 'A05:2021 - Security Misconfiguration',
+    'B320': 'A05:2021 - Security Misconfiguration',
+    'B405': 'A05:2021 - Security Misconfiguration',
+    'B406': 'A05:2021 - Security Misconfiguration',
+    'B407': 'A05:2021 - Security Misconfiguration',
+    'B408': 'A05:2021 - Security Misconfiguration',
+    'B409': 'A05:2021 - Security Misconfiguration',
+    'B410': 'A05:2021 - Security Misconfiguration',
+    'B411': 'A05:2021 - Security Misconfiguration',
+    # Vulnerable and outdated components
+    'B413': 'A06:2021 - Vulnerable Components',      # import pycrypto
+    # Identification and authentication failures
+    'B105': 'A07:2021 - Authentication Failures',    # hardcoded password string
+    'B106': 'A07:2021 - Authentication Failures',    # hardcoded password argument
+    'B107': 'A07:2021 - Authentication Failures',    # hardcoded password default
+    'B501': 'A07:2021 - Authentication Failures',    # requests verify=False
+    'B507': 'A07:2021 - Authentication Failures',    # SSH host key not verified
+    # Software and data integrity failures
+    'B301': 'A08:2021 - Software and Data Integrity',  # pickle
+    'B302': 'A08:2021 - Software and Data Integrity',  # marshal
+    'B403': 'A08:2021 - Software and Data Integrity',  # import pickle
+    'B506': 'A08:2021 - Software and Data Integrity',  # yaml.load
+    'B613': 'A08:2021 - Software and Data Integrity',  # trojan source
+    'B614': 'A08:2021 - Software and Data Integrity',  # torch.load
+    # Security logging and monitoring failures
+    'B110': 'A09:2021 - Security Logging Failures',  # try/except/pass
+    'B112': 'A09:2021 - Security Logging Failures',  # try/except/continue
+    # Server-side request forgery
+    'B310': 'A10:2021 - Server-Side Request Forgery',  # urllib urlopen
+}
+
+# Fallback for test IDs not listed above (e.g. third-party Bandit plugins):
+# keywords in Bandit test names and the OWASP category they map to, in priority order
+OWASP_KEYWORD_CATEGORIES = [
+    (('sql', 'injection', 'exec', 'eval'), 'A03:2021 - Injection'),
+    (('weak', 'crypto', 'hash', 'md5', 'sha1'), 'A02:2021 - Cryptographic Failures'),
+    (('assert', 'debug', 'hardcoded'), 'A05:2021 - Security Misconfiguration'),
+]
+OWASP_DEFAULT_CATEGORY = 'A04:2021 - Insecure Design'
+
+# Most worker processes run_bandit_many spreads in-process scans over
+SCAN_POOL_MAX_WORKERS = 4
+
+# One pass over a test name finds every keyword; group 'cN' is the Nth category above
+OWASP_KEYWORDS_RE = re.compile('|'.join(
+    f'(?P<c{rank}>' + '|'.join(map(re.escape, keywords)) + ')'
+    for rank, (keywords, _) in enumerate(OWASP_KEYWORD_CATEGORIES)
+))
 
 
 class SecurityScanner:
@@ -26,7 +172,56 @@ class SecurityScanner:
     
     def __init__(self):
         """Initialize the security scanner"""
-        self.bandit_available = self._check_bandit_available()
+        # Prefer Bandit's Python API; only probe for the CLI when it can't be imported
+        self.bandit_in_process = BANDIT_AVAILABLE
+        self.bandit_config = bandit_config.BanditConfig() if BANDIT_AVAILABLE else None
+        self.bandit_available = self.bandit_in_process or self._check_bandit_available()
+        
+        # Scan results keyed by (scan kind, source hash); agents often re-scan the same code
+        self._result_cache = OrderedDict()
+        self._result_cache_size = 256
+        self._result_cache_lock = threading.Lock()
+    
+    def _cache_key(self, kind: str, code: str) -> tuple:
+        """Cache key for a scan: the scan kind plus a short hash of the source"""
+        return (kind, hashlib.blake2b(code.encode('utf-8'), digest_size=16).digest())
+    
+    def _cache_get(self, key: tuple):
+        """Look up a cached result, returning None on a miss"""
+        with self._result_cache_lock:
+            if key in self._result_cache:
+                self._result_cache.move_to_end(key)
+                return self._result_cache[key]
+        return None
+    
+    def _cache_put(self, key: tuple, result) -> None:
+        """Store a result unless it carries an 'error' (timeouts, crashes)"""
+        if isinstance(result, dict) and 'error' in result:
+            return
+        
+        with self._result_cache_lock:
+            self._result_cache[key] = result
+            if len(self._result_cache) > self._result_cache_size:
+                self._result_cache.popitem(last=False)
+    
+    def _cached(self, kind: str, code: str, scan: Callable):
+        """
+        Return a cached scan result for this code, running the scan on a miss
+        
+        Results that carry an 'error' (timeouts, crashes) are not cached.
+        Cached results are shared between callers and must not be mutated.
+        
+        Args:
+            kind: Name of the scan, so different scans of the same code don't collide
+            code: Python source code
+            scan: Function computing the result from the code
+        """
+        key = self._cache_key(kind, code)
+        result = self._cache_get(key)
+        if result is None:
+            result = scan(code)
+            self._cache_put(key, result)
+        return result
     
     def _check_bandit_available(self) -> bool:
         """Check if Bandit is installed"""
@@ -58,23 +253,55 @@ class SecurityScanner:
                 'severity_counts': {}
             }
         
-        # Write code to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code)
-            temp_file = f.name
+        return self._cached('bandit', code, self._run_bandit_uncached)
+    
+    def _run_bandit_uncached(self, code: str) -> Dict:
+        """Run Bandit on code, bypassing the result cache"""
+        if self.bandit_in_process:
+            return self._run_bandit_in_process(code)
         
         try:
-            # Run Bandit with JSON output
+            # Run Bandit with JSON output, feeding the code over stdin. Output is
+            # kept as bytes, which orjson parses directly
             result = subprocess.run(
-                ['bandit', '-f', 'json', temp_file],
+                ['bandit', '-f', 'json', '-'],
+                input=code.encode('utf-8'),
                 capture_output=True,
-                text=True,
                 timeout=30
             )
-            
+        
+        except subprocess.TimeoutExpired:
+            return {
+                'available': True,
+                'error': 'Bandit scan timed out',
+                'issues': [],
+                'severity_counts': {}
+            }
+        
+        except Exception as e:
+            return {
+                'available': True,
+                'error': str(e),
+                'issues': [],
+                'severity_counts': {}
+            }
+        
+        return self._build_bandit_result(result.stdout)
+    
+    def _build_bandit_result(self, stdout: bytes) -> Dict:
+        """
+        Build the run_bandit() result from the Bandit CLI's JSON output
+        
+        Args:
+            stdout: Raw stdout of 'bandit -f json'
+        
+        Returns:
+            Same structure as run_bandit()
+        """
+        try:
             # Parse JSON output
-            if result.stdout:
-                output = json.loads(result.stdout)
+            if stdout:
+                output = json_loads(stdout)
                 issues = self._parse_bandit_output(output)
                 
                 return {
@@ -93,21 +320,93 @@ class SecurityScanner:
                     'message': 'No issues found'
                 }
         
-        except subprocess.TimeoutExpired:
+        except json.JSONDecodeError as e:
             return {
                 'available': True,
-                'error': 'Bandit scan timed out',
+                'error': f'Failed to parse Bandit output: {e}',
                 'issues': [],
                 'severity_counts': {}
             }
         
-        except json.JSONDecodeError as e:
+        except Exception as e:
             return {
                 'available': True,
-                'error': f'Failed to parse Bandit output: {e}',
+                'error': str(e),
                 'issues': [],
                 'severity_counts': {}
             }
+    
+    async def run_bandit_many(self, codes: List[str]) -> List[Dict]:
+        """
+        Run Bandit on several pieces of code concurrently
+        
+        With the Bandit CLI each scan is a separate process, so the scans are
+        launched together and awaited as a group; total time is close to the
+        slowest scan rather than the sum. In-process scans are CPU-bound, so
+        uncached ones are spread over a shared pool of worker processes (up to
+        SCAN_POOL_MAX_WORKERS) when there is more than one CPU and more than one
+        scan to run; otherwise they run in a thread, off the event loop.
+        
+        Args:
+            codes: Python source code strings to scan
+        
+        Returns:
+            One run_bandit() result per input, in the same order
+        """
+        if not self.bandit_available:
+            return [self.run_bandit(code) for code in codes]
+        
+        if not self.bandit_in_process:
+            return list(await asyncio.gather(*(self._run_bandit_async(code) for code in codes)))
+        
+        keys = [self._cache_key('bandit', code) for code in codes]
+        results = [self._cache_get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        loop = asyncio.get_running_loop()
+        
+        if len(missing) < 2 or (os.cpu_count() or 1) < 2:
+            # Not worth a worker process, but still run off the event loop
+            scanned = await asyncio.gather(*(
+                loop.run_in_executor(None, self._run_bandit_uncached, codes[i]) for i in missing
+            ))
+        else:
+            pool = _get_scan_pool()
+            scanned = await asyncio.gather(*(
+                loop.run_in_executor(pool, _scan_in_worker, codes[i]) for i in missing
+            ))
+        
+        for i, result in zip(missing, scanned):
+            self._cache_put(keys[i], result)
+            results[i] = result
+        
+        return results
+    
+    async def _run_bandit_async(self, code: str) -> Dict:
+        """Run the Bandit CLI on code without blocking the event loop"""
+        key = self._cache_key('bandit', code)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                'bandit', '-f', 'json', '-',
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, _ = await asyncio.wait_for(process.communicate(code.encode('utf-8')), timeout=30)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return {
+                    'available': True,
+                    'error': 'Bandit scan timed out',
+                    'issues': [],
+                    'severity_counts': {}
+                }
         
         except Exception as e:
             return {
@@ -117,10 +416,66 @@ class SecurityScanner:
                 'severity_counts': {}
             }
         
-        finally:
-            # Cleanup temp file
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+        result = self._build_bandit_result(stdout)
+        self._cache_put(key, result)
+        return result
+    
+    def _run_bandit_in_process(self, code: str) -> Dict:
+        """
+        Run Bandit through its public Python API on a temp copy of the code
+        
+        Avoids the subprocess start-up and JSON round trip of the CLI.
+        
+        Args:
+            code: Python source code to scan
+        
+        Returns:
+            Same structure as run_bandit()
+        """
+        try:
+            fd, path = tempfile.mkstemp(suffix='.py')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(code.encode('utf-8'))
+                
+                manager = bandit_manager.BanditManager(self.bandit_config, 'file', quiet=True)
+                manager.discover_files([path])
+                manager.run_tests()
+                
+                # Built while the file exists, since Bandit reads the code snippets back from it
+                output = {
+                    'results': [issue.as_dict() for issue in manager.get_issue_list()],
+                    'errors': [{'filename': name, 'reason': reason} for name, reason in manager.skipped],
+                    'metrics': manager.metrics.data
+                }
+            finally:
+                os.unlink(path)
+                linecache.checkcache(path)
+            
+            # Report the code under the CLI's stdin name rather than the temp path
+            for entry in output['results'] + output['errors']:
+                entry['filename'] = '<stdin>'
+            output['metrics'] = {
+                ('<stdin>' if name == path else name): values
+                for name, values in output['metrics'].items()
+            }
+            issues = self._parse_bandit_output(output)
+            
+            return {
+                'available': True,
+                'total_issues': len(issues),
+                'issues': issues,
+                'severity_counts': self._count_severity(issues),
+                'raw_output': output
+            }
+        
+        except Exception as e:
+            return {
+                'available': True,
+                'error': str(e),
+                'issues': [],
+                'severity_counts': {}
+            }
     
     def _parse_bandit_output(self, output: Dict) -> List[Dict]:
         """
@@ -132,20 +487,19 @@ class SecurityScanner:
         Returns:
             List of security issues
         """
-        issues = []
-        
-        for result in output.get('results', []):
-            issues.append({
+        return [
+            {
                 'line': result.get('line_number'),
                 'severity': result.get('issue_severity'),
                 'confidence': result.get('issue_confidence'),
                 'type': result.get('test_name'),
+                'test_id': result.get('test_id'),
                 'description': result.get('issue_text'),
                 'code': result.get('code', '').strip(),
-                'cwe': result.get('issue_cwe', {}).get('id') if result.get('issue_cwe') else None
-            })
-        
-        return issues
+                'cwe': (result.get('issue_cwe') or {}).get('id')
+            }
+            for result in output.get('results', [])
+        ]
     
     def _count_severity(self, issues: List[Dict]) -> Dict:
         """
@@ -176,6 +530,10 @@ class SecurityScanner:
         Returns:
             Dictionary of OWASP Top 10 findings
         """
+        return self._cached('owasp', code, self._check_owasp_top10_uncached)
+    
+    def _check_owasp_top10_uncached(self, code: str) -> Dict:
+        """Map Bandit findings to OWASP categories, bypassing the result cache"""
         # Run Bandit and map to OWASP categories
         bandit_results = self.run_bandit(code)
         
@@ -192,25 +550,13 @@ class SecurityScanner:
             'A10:2021 - Server-Side Request Forgery': []
         }
         
-        # Map Bandit findings to OWASP categories
+        # Map Bandit findings to OWASP categories by test ID
         for issue in bandit_results.get('issues', []):
-            issue_type = issue.get('type', '').lower()
-            
-            # Injection
-            if any(keyword in issue_type for keyword in ['sql', 'injection', 'exec', 'eval']):
-                owasp_categories['A03:2021 - Injection'].append(issue)
+            category = BANDIT_ID_TO_OWASP.get(issue.get('test_id'))
+            if category is None:
+                category = self._owasp_category(issue.get('type') or '')
             
-            # Cryptographic Failures
-            elif any(keyword in issue_type for keyword in ['weak', 'crypto', 'hash', 'md5', 'sha1']):
-                owasp_categories['A02:2021 - Cryptographic Failures'].append(issue)
-            
-            # Security Misconfiguration
-            elif any(keyword in issue_type for keyword in ['assert', 'debug', 'hardcoded']):
-                owasp_categories['A05:2021 - Security Misconfiguration'].append(issue)
-            
-            # Default to Insecure Design
-            else:
-                owasp_categories['A04:2021 - Insecure Design'].append(issue)
+            owasp_categories[category].append(issue)
         
         # Remove empty categories
         owasp_results = {k: v for k, v in owasp_categories.items() if v}
@@ -221,6 +567,23 @@ class SecurityScanner:
             'summary': self._generate_owasp_summary(owasp_results)
         }
     
+    def _owasp_category(self, issue_type: str) -> str:
+        """
+        Map a Bandit test name to an OWASP Top 10 category by keyword
+        
+        Used for test IDs missing from BANDIT_ID_TO_OWASP.
+        
+        Args:
+            issue_type: Bandit test name (e.g. 'hardcoded_sql_expressions')
+        
+        Returns:
+            The highest-priority category whose keywords appear in the name
+        """
+        ranks = [int(match.lastgroup[1:]) for match in OWASP_KEYWORDS_RE.finditer(issue_type.lower())]
+        if not ranks:
+            return OWASP_DEFAULT_CATEGORY
+        return OWASP_KEYWORD_CATEGORIES[min(ranks)][1]
+    
     def _generate_owasp_summary(self, owasp_results: Dict) -> str:
         """
         Generate a summary of OWASP findings
@@ -250,30 +613,86 @@ class SecurityScanner:
         Returns:
             List of potential secrets found
         """
-        import re
-        
+        return self._cached('secrets', code, self._scan_for_secrets_uncached)
+    
+    def _scan_for_secrets_uncached(self, code: str) -> List[Dict]:
+        """Scan for hardcoded secrets, bypassing the result cache"""
         secrets = []
-        lines = code.split('\n')
-        
-        # Patterns for common secrets
-        patterns = [
-            (r'password\s*=\s*["\'][^"\']+["\']', 'Password'),
-            (r'api[_-]?key\s*=\s*["\'][^"\']+["\']', 'API Key'),
-            (r'secret\s*=\s*["\'][^"\']+["\']', 'Secret'),
-            (r'token\s*=\s*["\'][^"\']+["\']', 'Token'),
-            (r'(aws|amazon)[_-]?secret', 'AWS Secret'),
-            (r'private[_-]?key', 'Private Key'),
-        ]
-        
-        for i, line in enumerate(lines, 1):
-            for pattern, secret_type in patterns:
-                if re.search(pattern, line, re.IGNORECASE):
+        line_no = 1
+        line_start = 0
+        pos = 0
+        
+        # Search the whole source with the fused regex and only slice out the
+        # lines it lands on, instead of splitting every line up front
+        while True:
+            match = SECRETS_RE.search(code, pos)
+            if match is None:
+                break
+            
+            start = match.start()
+            line_no += code.count('\n', line_start, start)
+            line_start = code.rfind('\n', 0, start) + 1
+            line_end = code.find('\n', start)
+            if line_end == -1:
+                line_end = len(code)
+            line = code[line_start:line_end]
+            
+            # Assignment patterns can't match a line without '=' and a quote
+            has_assignment = '=' in line and ('"' in line or "'" in line)
+            
+            # A line can hold several kinds of secret, so report each matching pattern.
+            # The fused match may span lines; the per-line patterns decide
+            for pattern, secret_type, needs_assignment in SECRET_PATTERNS:
+                if needs_assignment and not has_assignment:
+                    continue
+                if pattern.search(line):
                     secrets.append({
-                        'line': i,
+                        'line': line_no,
                         'type': secret_type,
                         'severity': 'HIGH',
                         'description': f'Hardcoded {secret_type} detected',
                         'code': line.strip()
                     })
+            
+            if line_end == len(code):
+                break
+            pos = line_end + 1
         
-        return secrets
\ No newline at end of file
+        return secrets
+
+
+# Scanner owned by each run_bandit_many worker process, so Bandit's config
+# and plugins load once per worker rather than once per scan
+_worker_scanner = None
+
+
+def _init_scan_worker():
+    """Process pool initializer: create the worker's scanner"""
+    global _worker_scanner
+    _worker_scanner = SecurityScanner()
+
+
+def _scan_in_worker(code: str) -> Dict:
+    """Run one uncached Bandit scan in a worker process"""
+    return _worker_scanner._run_bandit_uncached(code)
+
+
+# Worker pool shared by every scanner, started on first use and shut down at exit
+_scan_pool = None
+_scan_pool_lock = threading.Lock()
+
+
+def _get_scan_pool() -> ProcessPoolExecutor:
+    """Return the shared run_bandit_many worker pool, starting it on first use"""
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is None:
+            _scan_pool = ProcessPoolExecutor(
+                max_workers=min(SCAN_POOL_MAX_WORKERS, os.cpu_count() or 1),
+                # Spawned, not forked: the parent already runs threads (Streamlit, the
+                # pylint lock, the parallel reviewers) whose locks a fork would copy
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_scan_worker
+            )
+            atexit.register(_scan_pool.shutdown, wait=False)
+        return _scan_pool
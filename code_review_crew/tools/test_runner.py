@@ -7,8 +7,69 @@ Wrapper for pytest to run tests and collect coverage information.
 import subprocess
 import tempfile
 import os
+import sys
+import ast
 import json
-from typing import Dict, List
+import functools
+import re
+import select
+import shutil
+import signal
+import threading
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# "TOTAL  <stmts>  <miss>  <cover>%" line of pytest-cov's terminal report
+COVERAGE_TOTAL_RE = re.compile(r'TOTAL\s+\d+\s+\d+\s+(\d+)%')
+
+# Helper that serves runs from one warm pytest process; it forks, so POSIX only
+PYTEST_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pytest_worker.py')
+PYTEST_WORKER_SUPPORTED = hasattr(os, 'fork')
+
+# Report symbol for each test status
+STATUS_SYMBOLS = {
+    'PASSED': '✓',
+    'FAILED': '✗',
+    'SKIPPED': '⊘'
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _pytest_command() -> str:
+    """Resolve the pytest executable on PATH once, instead of a PATH search per run"""
+    return shutil.which("pytest") or "pytest"
+
+
+@functools.lru_cache(maxsize=1)
+def _pytest_available() -> bool:
+    """Check once per process whether the pytest command works"""
+    try:
+        result = subprocess.run(
+            [_pytest_command(), "--version"],
+            capture_output=True,
+            timeout=5
+        )
+        return result.returncode == 0
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def _pytest_cov_available() -> bool:
+    """Check once per process whether pytest accepts --cov (pytest-cov installed)"""
+    try:
+        # --version and --help exit 0 even with unknown options, so look for the option itself
+        result = subprocess.run(
+            [_pytest_command(), "--help"],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        return result.returncode == 0 and '--cov' in result.stdout
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return False
 
 
 class TestRunner:
@@ -22,21 +83,18 @@ class TestRunner:
     - Parse test output
     """
     
+    # Warm pytest worker shared by all runners, started on first use
+    _worker = None
+    _worker_disabled = False
+    _worker_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize the test runner"""
         self.pytest_available = self._check_pytest_available()
     
     def _check_pytest_available(self) -> bool:
         """Check if pytest is installed"""
-        try:
-            result = subprocess.run(
-                ["pytest", "--version"],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+        return _pytest_available()
     
     def run_tests(self, test_code: str, source_code: str = None) -> Dict:
         """
@@ -60,30 +118,31 @@ class TestRunner:
         
         # Create temporary directory
         with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            
             # Write source code if provided
             if source_code:
-                source_file = os.path.join(temp_dir, 'source.py')
-                with open(source_file, 'w') as f:
-                    f.write(source_code)
+                (temp_path / 'source.py').write_text(source_code)
             
             # Write test code
-            test_file = os.path.join(temp_dir, 'test_code.py')
-            with open(test_file, 'w') as f:
-                f.write(test_code)
+            test_file = temp_path / 'test_code.py'
+            test_file.write_text(test_code)
+            
+            # Structured per-test results; JUnit XML is built into pytest
+            report_file = os.path.join(temp_dir, 'report.xml')
             
             try:
-                # Run pytest with verbose output and JSON report
-                result = subprocess.run(
-                    ['pytest', test_file, '-v', '--tb=short'],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
+                # Run pytest with verbose output and a JUnit XML report
+                result = self._run_pytest(
+                    [str(test_file), '-v', '--tb=short', f'--junitxml={report_file}'],
                     cwd=temp_dir
                 )
                 
-                # Parse output
+                # Parse the report, falling back to scraping the output
                 output = result.stdout + result.stderr
-                results = self._parse_pytest_output(output, result.returncode)
+                results = self._parse_junit_report(report_file)
+                if results is None:
+                    results = self._parse_pytest_output(output, result.returncode)
                 
                 return {
                     'available': True,
@@ -116,6 +175,156 @@ class TestRunner:
                     'failed': 0
                 }
     
+    def _run_pytest(self, args: List[str], cwd: str, timeout: int = 30) -> subprocess.CompletedProcess:
+        """
+        Run pytest with the given arguments
+        
+        Goes through the shared warm worker when it is free, otherwise
+        starts a one-shot pytest process.
+        
+        Args:
+            args: Command line arguments for pytest
+            cwd: Directory to run in
+            timeout: Seconds before the run is abandoned
+        
+        Returns:
+            Completed process with text stdout and stderr
+        
+        Raises:
+            subprocess.TimeoutExpired: If the run takes longer than timeout
+        """
+        if (PYTEST_WORKER_SUPPORTED and not TestRunner._worker_disabled
+                and TestRunner._worker_lock.acquire(blocking=False)):
+            try:
+                result = self._run_in_worker(args, cwd, timeout)
+            finally:
+                TestRunner._worker_lock.release()
+            
+            if result is not None:
+                return result
+        
+        return subprocess.run(
+            [_pytest_command()] + args,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=cwd
+        )
+    
+    def _run_in_worker(self, args: List[str], cwd: str, timeout: int) -> Optional[subprocess.CompletedProcess]:
+        """
+        Run pytest in the warm worker, starting it if needed
+        
+        Must be called with _worker_lock held.
+        
+        Returns:
+            Completed process, or None if the worker could not serve the run
+        """
+        worker = TestRunner._worker
+        started = worker is None or worker.poll() is not None
+        
+        if started:
+            try:
+                worker = subprocess.Popen(
+                    [sys.executable, '-u', PYTEST_WORKER_SCRIPT],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True
+                )
+            except OSError:
+                TestRunner._worker_disabled = True
+                return None
+            TestRunner._worker = worker
+        
+        stdout_file = Path(cwd) / '.pytest_stdout'
+        stderr_file = Path(cwd) / '.pytest_stderr'
+        request = {'args': args, 'cwd': cwd, 'stdout': str(stdout_file), 'stderr': str(stderr_file)}
+        
+        try:
+            worker.stdin.write((json.dumps(request) + '\n').encode('utf-8'))
+            worker.stdin.flush()
+            
+            ready, _, _ = select.select([worker.stdout], [], [], timeout)
+            if not ready:
+                self._stop_worker()
+                raise subprocess.TimeoutExpired(['pytest'] + args, timeout)
+            
+            reply = worker.stdout.readline()
+        except OSError:
+            reply = b''
+        
+        if not reply:
+            # A worker that dies on its first run can't import pytest; stop trying
+            self._stop_worker()
+            if started:
+                TestRunner._worker_disabled = True
+            return None
+        
+        return subprocess.CompletedProcess(
+            ['pytest'] + args,
+            json.loads(reply)['returncode'],
+            stdout_file.read_text(),
+            stderr_file.read_text()
+        )
+    
+    @staticmethod
+    def _stop_worker():
+        """Kill the worker together with any run it has forked"""
+        worker = TestRunner._worker
+        TestRunner._worker = None
+        
+        if worker is not None and worker.poll() is None:
+            try:
+                os.killpg(worker.pid, signal.SIGKILL)
+            except OSError:
+                worker.kill()
+            worker.wait()
+    
+    def _parse_junit_report(self, report_file: str) -> Optional[Dict]:
+        """
+        Parse the JUnit XML report written by pytest --junitxml
+        
+        Args:
+            report_file: Path to the report
+        
+        Returns:
+            Parsed test results in the same shape as _parse_pytest_output(),
+            or None if the report is missing or unreadable
+        """
+        try:
+            root = ET.parse(report_file).getroot()
+        except (OSError, ET.ParseError):
+            return None
+        
+        results = {
+            'tests_run': 0,
+            'passed': 0,
+            'failed': 0,
+            'skipped': 0,
+            'details': []
+        }
+        
+        for case in root.iter('testcase'):
+            if case.find('skipped') is not None:
+                status = 'SKIPPED'
+                results['skipped'] += 1
+            elif case.find('failure') is not None or case.find('error') is not None:
+                status = 'FAILED'
+                results['failed'] += 1
+                results['tests_run'] += 1
+            else:
+                status = 'PASSED'
+                results['passed'] += 1
+                results['tests_run'] += 1
+            
+            results['details'].append({
+                'name': case.get('name', ''),
+                'status': status
+            })
+        
+        return results
+    
     def _parse_pytest_output(self, output: str, exit_code: int) -> Dict:
         """
         Parse pytest output to extract test results
@@ -135,31 +344,29 @@ class TestRunner:
             'details': []
         }
         
+        details_append = results['details'].append
+        
         # Count test results from output
         for line in output.split('\n'):
             if ' PASSED' in line:
+                status = 'PASSED'
                 results['passed'] += 1
                 results['tests_run'] += 1
-                test_name = line.split('::')[-1].split(' ')[0]
-                results['details'].append({
-                    'name': test_name,
-                    'status': 'PASSED'
-                })
             elif ' FAILED' in line:
+                status = 'FAILED'
                 results['failed'] += 1
                 results['tests_run'] += 1
-                test_name = line.split('::')[-1].split(' ')[0]
-                results['details'].append({
-                    'name': test_name,
-                    'status': 'FAILED'
-                })
             elif ' SKIPPED' in line:
+                status = 'SKIPPED'
                 results['skipped'] += 1
-                test_name = line.split('::')[-1].split(' ')[0]
-                results['details'].append({
-                    'name': test_name,
-                    'status': 'SKIPPED'
-                })
+            else:
+                continue
+            
+            # Test name: after the last '::', up to the first space
+            details_append({
+                'name': line.rpartition('::')[2].partition(' ')[0],
+                'status': status
+            })
         
         return results
     
@@ -181,14 +388,7 @@ class TestRunner:
             }
         
         # Check if pytest-cov is available
-        try:
-            subprocess.run(['pytest', '--cov', '--version'], 
-                         capture_output=True, timeout=5)
-            cov_available = True
-        except:
-            cov_available = False
-        
-        if not cov_available:
+        if not _pytest_cov_available():
             return {
                 'available': True,
                 'coverage_available': False,
@@ -198,23 +398,19 @@ class TestRunner:
         
         # Create temporary directory
         with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            
             # Write source code
-            source_file = os.path.join(temp_dir, 'source.py')
-            with open(source_file, 'w') as f:
-                f.write(source_code)
+            (temp_path / 'source.py').write_text(source_code)
             
             # Write test code
-            test_file = os.path.join(temp_dir, 'test_code.py')
-            with open(test_file, 'w') as f:
-                f.write(test_code)
+            test_file = temp_path / 'test_code.py'
+            test_file.write_text(test_code)
             
             try:
                 # Run pytest with coverage
-                result = subprocess.run(
-                    ['pytest', test_file, '--cov=source', '--cov-report=term'],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
+                result = self._run_pytest(
+                    [str(test_file), '--cov=source', '--cov-report=term'],
                     cwd=temp_dir
                 )
                 
@@ -248,10 +444,8 @@ class TestRunner:
         Returns:
             Coverage percentage
         """
-        import re
-        
         # Look for coverage percentage in output
-        match = re.search(r'TOTAL\s+\d+\s+\d+\s+(\d+)%', output)
+        match = COVERAGE_TOTAL_RE.search(output)
         if match:
             return float(match.group(1))
         
@@ -268,13 +462,26 @@ class TestRunner:
             Validation results
         """
         try:
-            # Try to compile the code
-            compile(test_code, '<test>', 'exec')
+            # Compile from the tree so the compiler still rejects e.g. 'return' outside a function
+            tree = ast.parse(test_code, '<test>')
+            compile(tree, '<test>', 'exec')
             
-            # Check for pytest conventions
-            has_test_functions = 'def test_' in test_code
-            has_imports = 'import' in test_code
-            has_assertions = 'assert' in test_code
+            # Check for pytest conventions in one walk; words in comments or strings don't count
+            has_test_functions = has_imports = has_assertions = False
+            
+            for node in ast.walk(tree):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    has_test_functions = has_test_functions or node.name.startswith('test_')
+                elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                    has_imports = True
+                elif isinstance(node, ast.Assert):
+                    has_assertions = True
+                elif isinstance(node, ast.Attribute) and node.attr.startswith('assert'):
+                    # self.assertEqual(...), mock.assert_called_once(), ...
+                    has_assertions = True
+                
+                if has_test_functions and has_imports and has_assertions:
+                    break
             
             issues = []
             if not has_test_functions:
@@ -333,11 +540,7 @@ class TestRunner:
             report.append("\nTest Details:")
             report.append("-" * 60)
             for detail in test_results['details']:
-                status_symbol = {
-                    'PASSED': '✓',
-                    'FAILED': '✗',
-                    'SKIPPED': '⊘'
-                }.get(detail['status'], '?')
+                status_symbol = STATUS_SYMBOLS.get(detail['status'], '?')
                 report.append(f"  {status_symbol} {detail['name']}")
         
         report.append("=" * 60)
@@ -6,15 +6,80 @@ Extracts functions, classes, imports, and other code structures.
 """
 
 import ast
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any
 
 
+# Top-level modules treated as standard library when classifying imports;
+# the full list ships with Python 3.10+, older versions get the common ones
+STANDARD_LIBS = frozenset(getattr(sys, 'stdlib_module_names', ())) or frozenset({
+    'os', 'sys', 'json', 'math', 'datetime', 'collections',
+    'itertools', 'functools', 're', 'typing', 'pathlib'
+})
+
+# Parses keyed by source hash, shared by all parsers; the same code is often parsed
+# by several agents in one review. Entries are (tree, collected results, parse() result)
+PARSE_CACHE_SIZE = 64
+_parse_cache = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+# Node type groups for isinstance checks, built once instead of per call
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Statements that add a level to the nesting depth
+NESTING_NODES = (ast.If, ast.For, ast.While, ast.With, ast.Try)
+
+
+def _walk(root: ast.AST, prune: tuple = ()) -> List[ast.AST]:
+    """
+    List every node under root in the same breadth-first order as ast.walk
+    
+    Reads each node's fields directly instead of going through the
+    ast.walk/ast.iter_child_nodes generators, which is noticeably faster
+    on large modules.
+    
+    Args:
+        root: Node to start from
+        prune: Node types to list without descending into
+    
+    Returns:
+        All nodes, root first
+    """
+    nodes = [root]
+    append = nodes.append
+    extend = nodes.extend
+    
+    # The list grows while it is iterated, so it doubles as the work queue
+    for node in nodes:
+        if prune and isinstance(node, prune) and node is not root:
+            continue
+        
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if value.__class__ is list:
+                extend([item for item in value if isinstance(item, ast.AST)])
+            elif isinstance(value, ast.AST):
+                append(value)
+    
+    return nodes
+
+
 class CodeParser:
     """Parser for Python source code using AST"""
     
     def __init__(self):
         self.tree = None
         self.source_code = ""
+        
+        # Results of the single tree walk shared by the extractors, reset on parse()
+        self._parsed = None
+        
+        # Source as UTF-8 lines (matching the byte offsets AST nodes carry), built on demand
+        self._source_lines = None
+        self._unparse_cache = {}
     
     def parse(self, code: str) -> Dict:
         """
@@ -24,21 +89,40 @@ class CodeParser:
             code: Python source code
         
         Returns:
-            Dictionary containing all parsed information
+            Dictionary containing all parsed information. Results for the same
+            code are cached and shared between callers; don't mutate them.
         """
         self.source_code = code
+        self._parsed = None
+        self._source_lines = None
+        self._unparse_cache = {}
+        
+        key = hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        with _parse_cache_lock:
+            cached = _parse_cache.get(key)
+            if cached is not None:
+                _parse_cache.move_to_end(key)
+        
+        if cached is not None:
+            tree, parsed, result = cached
+            if tree is not None:
+                self.tree = tree
+                self._parsed = parsed
+            return result
         
         try:
             self.tree = ast.parse(code)
         except SyntaxError as e:
-            return {
+            result = {
                 'error': 'syntax_error',
                 'message': str(e),
                 'line': e.lineno,
                 'offset': e.offset
             }
+            self._cache_parse(key, (None, None, result))
+            return result
         
-        return {
+        result = {
             'functions': self.extract_functions(),
             'classes': self.extract_classes(),
             'imports': self.extract_imports(),
@@ -47,195 +131,77 @@ class CodeParser:
             'complexity': self.calculate_basic_complexity(),
             'lines_of_code': len(code.split('\n'))
         }
+        self._cache_parse(key, (self.tree, self._parsed, result))
+        return result
+    
+    @staticmethod
+    def _cache_parse(key: bytes, entry: tuple):
+        """Store a parse in the shared cache, evicting the least recently used"""
+        with _parse_cache_lock:
+            _parse_cache[key] = entry
+            if len(_parse_cache) > PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
     
     def extract_functions(self) -> List[Dict]:
         """Extract all function definitions"""
         if not self.tree:
             return []
         
-        functions = []
-        
-        for node in ast.walk(self.tree):
-            if isinstance(node, ast.FunctionDef):
-                func_info = {
-                    'name': node.name,
-                    'line': node.lineno,
-                    'args': [arg.arg for arg in node.args.args],
-                    'returns': self._get_return_annotation(node),
-                    'decorators': [self._get_decorator_name(d) for d in node.decorator_list],
-                    'docstring': ast.get_docstring(node),
-                    'is_async': False,
-                    'body_lines': self._count_body_lines(node)
-                }
-                functions.append(func_info)
-            
-            elif isinstance(node, ast.AsyncFunctionDef):
-                func_info = {
-                    'name': node.name,
-                    'line': node.lineno,
-                    'args': [arg.arg for arg in node.args.args],
-                    'returns': self._get_return_annotation(node),
-                    'decorators': [self._get_decorator_name(d) for d in node.decorator_list],
-                    'docstring': ast.get_docstring(node),
-                    'is_async': True,
-                    'body_lines': self._count_body_lines(node)
-                }
-                functions.append(func_info)
-        
-        return functions
+        return self._collect()['functions']
     
     def extract_classes(self) -> List[Dict]:
         """Extract all class definitions"""
         if not self.tree:
             return []
         
-        classes = []
-        
-        for node in ast.walk(self.tree):
-            if isinstance(node, ast.ClassDef):
-                class_info = {
-                    'name': node.name,
-                    'line': node.lineno,
-                    'bases': [self._get_name(base) for base in node.bases],
-                    'decorators': [self._get_decorator_name(d) for d in node.decorator_list],
-                    'docstring': ast.get_docstring(node),
-                    'methods': self._extract_methods(node),
-                    'attributes': self._extract_attributes(node)
-                }
-                classes.append(class_info)
-        
-        return classes
+        return self._collect()['classes']
     
     def extract_imports(self) -> Dict:
         """Extract all import statements"""
         if not self.tree:
             return {}
         
-        imports = {
-            'standard': [],
-            'third_party': [],
-            'from_imports': []
-        }
-        
-        standard_libs = {
-            'os', 'sys', 'json', 'math', 'datetime', 'collections',
-            'itertools', 'functools', 're', 'typing', 'pathlib'
-        }
-        
-        for node in ast.walk(self.tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    module = alias.name.split('.')[0]
-                    target = 'standard' if module in standard_libs else 'third_party'
-                    imports[target].append({
-                        'module': alias.name,
-                        'alias': alias.asname,
-                        'line': node.lineno
-                    })
-            
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module.split('.')[0] if node.module else ''
-                target = 'standard' if module in standard_libs else 'third_party'
-                
-                for alias in node.names:
-                    imports['from_imports'].append({
-                        'module': node.module,
-                        'name': alias.name,
-                        'alias': alias.asname,
-                        'line': node.lineno,
-                        'type': target
-                    })
-        
-        return imports
+        return self._collect()['imports']
     
     def extract_global_variables(self) -> List[Dict]:
         """Extract global variable assignments"""
         if not self.tree:
             return []
         
-        variables = []
-        
-        for node in self.tree.body:
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name):
-                        variables.append({
-                            'name': target.id,
-                            'line': node.lineno,
-                            'type': self._infer_type(node.value)
-                        })
-        
-        return variables
+        return self._collect()['global_variables']
     
     def extract_docstrings(self) -> Dict:
         """Extract all docstrings from code"""
         if not self.tree:
             return {}
         
-        docstrings = {
-            'module': ast.get_docstring(self.tree),
-            'functions': {},
-            'classes': {}
-        }
-        
-        for node in ast.walk(self.tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                doc = ast.get_docstring(node)
-                if doc:
-                    docstrings['functions'][node.name] = doc
-            
-            elif isinstance(node, ast.ClassDef):
-                doc = ast.get_docstring(node)
-                if doc:
-                    docstrings['classes'][node.name] = doc
-        
-        return docstrings
+        return self._collect()['docstrings']
     
     def calculate_basic_complexity(self) -> Dict:
         """Calculate basic complexity metrics"""
         if not self.tree:
             return {}
         
-        complexity = {
-            'num_functions': 0,
-            'num_classes': 0,
-            'num_imports': 0,
-            'max_nesting_depth': 0,
-            'num_loops': 0,
-            'num_conditionals': 0
-        }
-        
-        for node in ast.walk(self.tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                complexity['num_functions'] += 1
-            elif isinstance(node, ast.ClassDef):
-                complexity['num_classes'] += 1
-            elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                complexity['num_imports'] += 1
-            elif isinstance(node, (ast.For, ast.While)):
-                complexity['num_loops'] += 1
-            elif isinstance(node, ast.If):
-                complexity['num_conditionals'] += 1
+        complexity = self._collect()['complexity']
         
-        complexity['max_nesting_depth'] = self._calculate_max_depth()
+        if complexity['max_nesting_depth'] is None:
+            complexity['max_nesting_depth'] = self._calculate_max_depth()
         
         return complexity
     
     def find_function(self, function_name: str) -> Optional[Dict]:
         """Find a specific function by name"""
-        functions = self.extract_functions()
-        for func in functions:
-            if func['name'] == function_name:
-                return func
-        return None
+        if not self.tree:
+            return None
+        
+        return self._collect()['function_index'].get(function_name)
     
     def find_class(self, class_name: str) -> Optional[Dict]:
         """Find a specific class by name"""
-        classes = self.extract_classes()
-        for cls in classes:
-            if cls['name'] == class_name:
-                return cls
-        return None
+        if not self.tree:
+            return None
+        
+        return self._collect()['class_index'].get(class_name)
     
     def get_function_calls(self) -> List[Dict]:
         """Extract all function calls in the code"""
@@ -244,7 +210,7 @@ class CodeParser:
         
         calls = []
         
-        for node in ast.walk(self.tree):
+        for node in _walk(self.tree):
             if isinstance(node, ast.Call):
                 func_name = self._get_call_name(node.func)
                 if func_name:
@@ -273,12 +239,163 @@ class CodeParser:
     
     # Helper methods
     
+    def _collect(self) -> Dict:
+        """
+        Walk the tree once, filling every extractor's results in the same pass
+        
+        The results are kept until the next parse(), so extract_*, find_* and
+        calculate_basic_complexity() share one traversal.
+        
+        Returns:
+            Dictionary of functions, classes, imports, global variables,
+            docstrings, node counts and name indexes for functions and classes
+        """
+        if self._parsed is not None:
+            return self._parsed
+        
+        parsed = {
+            'functions': [],
+            'classes': [],
+            'global_variables': [],
+            'imports': {
+                'standard': [],
+                'third_party': [],
+                'from_imports': []
+            },
+            'docstrings': {
+                'module': ast.get_docstring(self.tree),
+                'functions': {},
+                'classes': {}
+            },
+            'complexity': {
+                'num_functions': 0,
+                'num_classes': 0,
+                'num_imports': 0,
+                'max_nesting_depth': None,
+                'num_loops': 0,
+                'num_conditionals': 0
+            }
+        }
+        
+        handlers = {
+            ast.FunctionDef: self._collect_function,
+            ast.AsyncFunctionDef: self._collect_function,
+            ast.ClassDef: self._collect_class,
+            ast.Import: self._collect_import,
+            ast.ImportFrom: self._collect_import_from,
+            ast.For: self._collect_loop,
+            ast.While: self._collect_loop,
+            ast.If: self._collect_conditional
+        }
+        
+        # Globals are module-level assignments only, so they come from the body, not the walk
+        for node in self.tree.body:
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        parsed['global_variables'].append({
+                            'name': target.id,
+                            'line': node.lineno,
+                            'type': self._infer_type(node.value)
+                        })
+        
+        for node in _walk(self.tree):
+            handler = handlers.get(type(node))
+            if handler:
+                handler(node, parsed)
+        
+        # First definition wins, as a linear search over the lists would find
+        parsed['function_index'] = {}
+        for func in parsed['functions']:
+            parsed['function_index'].setdefault(func['name'], func)
+        
+        parsed['class_index'] = {}
+        for cls in parsed['classes']:
+            parsed['class_index'].setdefault(cls['name'], cls)
+        
+        self._parsed = parsed
+        return parsed
+    
+    def _collect_function(self, node: ast.FunctionDef, parsed: Dict):
+        """Record a function or async function definition"""
+        docstring = ast.get_docstring(node)
+        
+        parsed['functions'].append({
+            'name': node.name,
+            'line': node.lineno,
+            'args': [arg.arg for arg in node.args.args],
+            'returns': self._get_return_annotation(node),
+            'decorators': [self._get_decorator_name(d) for d in node.decorator_list],
+            'docstring': docstring,
+            'is_async': isinstance(node, ast.AsyncFunctionDef),
+            'body_lines': self._count_body_lines(node)
+        })
+        
+        if docstring:
+            parsed['docstrings']['functions'][node.name] = docstring
+        parsed['complexity']['num_functions'] += 1
+    
+    def _collect_class(self, node: ast.ClassDef, parsed: Dict):
+        """Record a class definition"""
+        docstring = ast.get_docstring(node)
+        
+        parsed['classes'].append({
+            'name': node.name,
+            'line': node.lineno,
+            'bases': [self._get_name(base) for base in node.bases],
+            'decorators': [self._get_decorator_name(d) for d in node.decorator_list],
+            'docstring': docstring,
+            'methods': self._extract_methods(node),
+            'attributes': self._extract_attributes(node)
+        })
+        
+        if docstring:
+            parsed['docstrings']['classes'][node.name] = docstring
+        parsed['complexity']['num_classes'] += 1
+    
+    def _collect_import(self, node: ast.Import, parsed: Dict):
+        """Record an 'import x' statement"""
+        for alias in node.names:
+            module = alias.name.partition('.')[0]
+            target = 'standard' if module in STANDARD_LIBS else 'third_party'
+            parsed['imports'][target].append({
+                'module': alias.name,
+                'alias': alias.asname,
+                'line': node.lineno
+            })
+        
+        parsed['complexity']['num_imports'] += 1
+    
+    def _collect_import_from(self, node: ast.ImportFrom, parsed: Dict):
+        """Record a 'from x import y' statement"""
+        module = node.module.partition('.')[0] if node.module else ''
+        target = 'standard' if module in STANDARD_LIBS else 'third_party'
+        
+        for alias in node.names:
+            parsed['imports']['from_imports'].append({
+                'module': node.module,
+                'name': alias.name,
+                'alias': alias.asname,
+                'line': node.lineno,
+                'type': target
+            })
+        
+        parsed['complexity']['num_imports'] += 1
+    
+    def _collect_loop(self, node: ast.AST, parsed: Dict):
+        """Count a for or while loop"""
+        parsed['complexity']['num_loops'] += 1
+    
+    def _collect_conditional(self, node: ast.If, parsed: Dict):
+        """Count an if statement"""
+        parsed['complexity']['num_conditionals'] += 1
+    
     def _extract_methods(self, class_node: ast.ClassDef) -> List[Dict]:
         """Extract methods from a class"""
         methods = []
         
         for node in class_node.body:
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if isinstance(node, FUNCTION_NODES):
                 methods.append({
                     'name': node.name,
                     'line': node.lineno,
@@ -291,23 +408,48 @@ class CodeParser:
     
     def _extract_attributes(self, class_node: ast.ClassDef) -> List[str]:
         """Extract class attributes"""
-        attributes = []
-        
-        for node in ast.walk(class_node):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Attribute):
-                        if isinstance(target.value, ast.Name) and target.value.id == 'self':
-                            attributes.append(target.attr)
+        attributes = set()
         
-        return list(set(attributes))
+        # Only search the class's own methods; 'self' inside a nested class is another object
+        for method in class_node.body:
+            if not isinstance(method, FUNCTION_NODES):
+                continue
+            
+            for node in _walk(method, prune=(ast.ClassDef,)):
+                if isinstance(node, ast.Assign):
+                    for target in node.targets:
+                        if isinstance(target, ast.Attribute):
+                            if isinstance(target.value, ast.Name) and target.value.id == 'self':
+                                attributes.add(target.attr)
+        
+        return list(attributes)
     
     def _get_return_annotation(self, node: ast.FunctionDef) -> Optional[str]:
         """Get return type annotation"""
         if node.returns:
-            return ast.unparse(node.returns)
+            return self._unparse(node.returns)
         return None
     
+    def _unparse(self, node: ast.AST) -> str:
+        """
+        ast.unparse, memoized on the node's source text
+        
+        The same annotation text always unparses the same way, and annotations
+        like 'Dict[str, Any]' repeat across a module, so the source slice is a
+        much cheaper key than re-running the unparser.
+        """
+        if self._source_lines is None:
+            self._source_lines = self.source_code.encode('utf-8').splitlines(keepends=True)
+        
+        if node.lineno != node.end_lineno or node.lineno > len(self._source_lines):
+            return ast.unparse(node)
+        
+        key = self._source_lines[node.lineno - 1][node.col_offset:node.end_col_offset]
+        text = self._unparse_cache.get(key)
+        if text is None:
+            text = self._unparse_cache[key] = ast.unparse(node)
+        return text
+    
     def _get_decorator_name(self, decorator: Any) -> str:
         """Get decorator name"""
         if isinstance(decorator, ast.Name):
@@ -361,10 +503,15 @@ class CodeParser:
         
         max_depth = current_depth
         
-        for child in ast.iter_child_nodes(node):
-            if isinstance(child, (ast.If, ast.For, ast.While, ast.With, ast.Try)):
-                child_depth = self._calculate_max_depth(child, current_depth + 1)
-                max_depth = max(max_depth, child_depth)
+        # Explicit stack instead of recursion; only nesting statements are descended into
+        stack = [(node, current_depth)]
+        while stack:
+            parent, depth = stack.pop()
+            for child in ast.iter_child_nodes(parent):
+                if isinstance(child, NESTING_NODES):
+                    stack.append((child, depth + 1))
+                    if depth + 1 > max_depth:
+                        max_depth = depth + 1
         
         return max_depth
 
@@ -4,16 +4,203 @@ Report Generator Utility
 Generates formatted code review reports in various formats (Markdown, HTML, JSON).
 """
 
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime
+from html import escape
+import functools
 import json
+import os
+import uuid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Document head and stylesheet shared by every HTML report
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Code Review Report</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
+            line-height: 1.6;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            border-radius: 10px;
+            margin-bottom: 30px;
+        }
+        .grade {
+            font-size: 3rem;
+            font-weight: bold;
+        }
+        .summary {
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        .issue-section {
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        .critical { border-left: 5px solid #d32f2f; }
+        .high { border-left: 5px solid #f57c00; }
+        .medium { border-left: 5px solid #fbc02d; }
+        .low { border-left: 5px solid #388e3c; }
+        .issue {
+            padding: 15px;
+            margin: 10px 0;
+            background: #f9f9f9;
+            border-radius: 5px;
+        }
+        .issue-title {
+            font-weight: bold;
+            margin-bottom: 5px;
+        }
+        .code-block {
+            background: #2d2d2d;
+            color: #f8f8f2;
+            padding: 15px;
+            border-radius: 5px;
+            overflow-x: auto;
+            font-family: 'Courier New', monospace;
+        }
+        .badge {
+            display: inline-block;
+            padding: 3px 8px;
+            border-radius: 3px;
+            font-size: 0.85rem;
+            font-weight: bold;
+        }
+        .badge-critical { background: #d32f2f; color: white; }
+        .badge-high { background: #f57c00; color: white; }
+        .badge-medium { background: #fbc02d; color: black; }
+        .badge-low { background: #388e3c; color: white; }
+    </style>
+</head>
+"""
+
+# Shared read-only defaults for missing review_data keys
+_EMPTY = ()
+_EMPTY_DICT = {}
+
+# Issue severities, most severe first
+SEVERITIES = ('critical', 'high', 'medium', 'low')
+
+# Per-severity display settings, in SEVERITIES order:
+# (severity, emoji, Markdown heading, Markdown limit or None for all, Markdown empty note)
+SEVERITY_TABLE = (
+    ('critical', '🔴', 'Critical Issues', None, 'No critical issues found.'),
+    ('high', '🟡', 'High Priority Issues', None, 'No high priority issues found.'),
+    ('medium', '🟠', 'Medium Priority Issues', 5, 'No medium priority issues found.'),
+    ('low', '💡', 'Suggestions', 3, 'No suggestions.'),
+)
+
+# Maximum issues listed per severity in the HTML report
+HTML_ISSUE_LIMIT = 10
+
+# Pre-rendered HTML per severity: (severity, section opening up to the issue count, empty note)
+HTML_SECTIONS = tuple(
+    (
+        severity,
+        f"""
+    <div class="issue-section {severity}">
+        <h2>{emoji} {severity.title()} Issues (""",
+        f"<p>No {severity} priority issues found.</p>",
+    )
+    for severity, emoji, _, _, _ in SEVERITY_TABLE
+)
+
+# Format of the "Generated" timestamp on every report
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Closing tags of every HTML report
+HTML_TAIL = """    </div>
+</body>
+</html>"""
+
+# Rendered issues kept per format; the same findings recur across re-rendered reports
+ISSUE_CACHE_SIZE = 4096
+
+# Stands in for an issue field that is absent (as opposed to present but None)
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=ISSUE_CACHE_SIZE, typed=True)
+def _render_issue_markdown(description, line, source, severity, suggestion, code) -> str:
+    """Render a Markdown issue entry, minus its leading '**<number>. '"""
+    md = f"{description}**\n"
+    
+    if line is not _MISSING:
+        md += f"- **Line:** {line}\n"
+    
+    if source is not _MISSING:
+        md += f"- **Detected by:** {source}\n"
+    
+    if severity is not _MISSING:
+        md += f"- **Severity:** {severity}\n"
+    
+    if suggestion is not _MISSING:
+        md += f"- **Fix:** {suggestion}\n"
+    
+    if code is not _MISSING:
+        md += f"\n```python\n{code}\n```\n"
+    
+    md += "\n"
+    return md
+
+
+@functools.lru_cache(maxsize=ISSUE_CACHE_SIZE, typed=True)
+def _render_issue_html(severity, description, line, suggestion, code) -> str:
+    """Render an HTML issue entry"""
+    html = f"""
+        <div class="issue">
+            <div class="issue-title">
+                <span class="badge badge-{severity}">{severity.upper()}</span>
+                {escape(str(description))}
+            </div>
+"""
+    
+    if line is not _MISSING:
+        html += f"            <p><strong>Line:</strong> {escape(str(line))}</p>\n"
+    
+    if suggestion is not _MISSING:
+        html += f"            <p><strong>Fix:</strong> {escape(str(suggestion))}</p>\n"
+    
+    if code is not _MISSING:
+        html += f"            <div class='code-block'>{escape(str(code))}</div>\n"
+    
+    html += "        </div>\n"
+    return html
 
 
 class ReportGenerator:
     """Generates formatted code review reports"""
     
-    def __init__(self):
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def __init__(self, timestamp: Optional[str] = None):
+        """
+        Initialize report generator
+        
+        Args:
+            timestamp: "Generated" time to stamp on reports (default: now)
+        """
+        self.timestamp = timestamp or datetime.now().strftime(TIMESTAMP_FORMAT)
     
     def generate_markdown(self, review_data: Dict) -> str:
         """
@@ -25,11 +212,25 @@ class ReportGenerator:
         Returns:
             Markdown formatted report
         """
-        md = f"""# Code Review Report
+        parts = []
+        self.write_markdown(review_data, parts.append)
+        return ''.join(parts)
+    
+    def write_markdown(self, review_data: Dict, write: Callable[[str], object]):
+        """
+        Write a Markdown format report piece by piece
+        
+        Args:
+            review_data: Review results dictionary
+            write: Called with each successive chunk of the report (e.g. a file's write)
+        """
+        issues = review_data.get('issues') or _EMPTY_DICT
+        
+        write(f"""# Code Review Report
 
 **Generated:** {self.timestamp}  
 **Overall Grade:** {review_data.get('grade', 'N/A')}  
-**Total Issues:** {self._count_total_issues(review_data.get('issues', {}))}
+**Total Issues:** {self._count_total_issues(issues)}
 
 ---
 
@@ -41,226 +242,132 @@ class ReportGenerator:
 
 ## Issues by Priority
 
-"""
-        
-        # Critical Issues
-        critical = review_data.get('issues', {}).get('critical', [])
-        md += f"### 🔴 Critical Issues ({len(critical)})\n\n"
-        
-        if critical:
-            for i, issue in enumerate(critical, 1):
-                md += self._format_issue_markdown(i, issue)
-        else:
-            md += "*No critical issues found.*\n\n"
-        
-        # High Priority
-        high = review_data.get('issues', {}).get('high', [])
-        md += f"### 🟡 High Priority Issues ({len(high)})\n\n"
-        
-        if high:
-            for i, issue in enumerate(high, 1):
-                md += self._format_issue_markdown(i, issue)
-        else:
-            md += "*No high priority issues found.*\n\n"
+""")
         
-        # Medium Priority
-        medium = review_data.get('issues', {}).get('medium', [])
-        md += f"### 🟠 Medium Priority Issues ({len(medium)})\n\n"
-        
-        if medium:
-            for i, issue in enumerate(medium[:5], 1):  # Show top 5
-                md += self._format_issue_markdown(i, issue)
-            if len(medium) > 5:
-                md += f"\n*...and {len(medium) - 5} more medium priority issues*\n\n"
-        else:
-            md += "*No medium priority issues found.*\n\n"
-        
-        # Low Priority
-        low = review_data.get('issues', {}).get('low', [])
-        md += f"### 💡 Suggestions ({len(low)})\n\n"
-        
-        if low:
-            for issue in low[:3]:  # Show top 3
-                md += f"- {issue.get('description', 'Issue')}\n"
-            if len(low) > 3:
-                md += f"\n*...and {len(low) - 3} more suggestions*\n\n"
-        else:
-            md += "*No suggestions.*\n\n"
+        for severity, emoji, title, limit, empty_note in SEVERITY_TABLE:
+            severity_issues = issues.get(severity, _EMPTY)
+            write(f"### {emoji} {title} ({len(severity_issues)})\n\n")
+            
+            if not severity_issues:
+                write(f"*{empty_note}*\n\n")
+                continue
+            
+            shown = severity_issues if limit is None else severity_issues[:limit]
+            if severity == 'low':
+                # Suggestions are a plain bullet list
+                for issue in shown:
+                    write(f"- {issue.get('description', 'Issue')}\n")
+            else:
+                for i, issue in enumerate(shown, 1):
+                    write(self._format_issue_markdown(i, issue))
+            
+            if limit is not None and len(severity_issues) > limit:
+                write(f"\n*...and {len(severity_issues) - limit} more {title.lower()}*\n\n")
         
         # Strengths
-        md += "---\n\n## ✅ Strengths\n\n"
-        strengths = review_data.get('strengths', [])
+        write("---\n\n## ✅ Strengths\n\n")
+        strengths = review_data.get('strengths', _EMPTY)
         if strengths:
             for strength in strengths:
-                md += f"- {strength}\n"
+                write(f"- {strength}\n")
         else:
-            md += "*No specific strengths identified.*\n"
+            write("*No specific strengths identified.*\n")
         
         # Next Steps
-        md += "\n---\n\n## 📋 Recommended Next Steps\n\n"
-        next_steps = review_data.get('next_steps', [])
+        write("\n---\n\n## 📋 Recommended Next Steps\n\n")
+        next_steps = review_data.get('next_steps', _EMPTY)
         if next_steps:
             for i, step in enumerate(next_steps, 1):
-                md += f"{i}. {step}\n"
+                write(f"{i}. {step}\n")
         else:
-            md += "*No specific next steps.*\n"
+            write("*No specific next steps.*\n")
         
         # Agent Feedback
         if 'agent_feedback' in review_data:
-            md += "\n---\n\n## 🤖 Agent Analysis\n\n"
-            for agent, feedback in review_data.get('agent_feedback', {}).items():
-                md += f"### {agent}\n\n"
+            write("\n---\n\n## 🤖 Agent Analysis\n\n")
+            for agent, feedback in review_data['agent_feedback'].items():
+                write(f"### {agent}\n\n")
                 if isinstance(feedback, dict) and 'summary' in feedback:
-                    md += f"{feedback['summary']}\n\n"
+                    write(f"{feedback['summary']}\n\n")
                 else:
-                    md += f"{feedback}\n\n"
-        
-        return md
+                    write(f"{feedback}\n\n")
     
     def generate_html(self, review_data: Dict) -> str:
         """
         Generate HTML format report
         
+        Review text (summary, issues, strengths, next steps) is HTML-escaped.
+        
         Args:
             review_data: Review results dictionary
         
         Returns:
             HTML formatted report
         """
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Code Review Report</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            line-height: 1.6;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-        }}
-        .grade {{
-            font-size: 3rem;
-            font-weight: bold;
-        }}
-        .summary {{
-            background: white;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .issue-section {{
-            background: white;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .critical {{ border-left: 5px solid #d32f2f; }}
-        .high {{ border-left: 5px solid #f57c00; }}
-        .medium {{ border-left: 5px solid #fbc02d; }}
-        .low {{ border-left: 5px solid #388e3c; }}
-        .issue {{
-            padding: 15px;
-            margin: 10px 0;
-            background: #f9f9f9;
-            border-radius: 5px;
-        }}
-        .issue-title {{
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-        .code-block {{
-            background: #2d2d2d;
-            color: #f8f8f2;
-            padding: 15px;
-            border-radius: 5px;
-            overflow-x: auto;
-            font-family: 'Courier New', monospace;
-        }}
-        .badge {{
-            display: inline-block;
-            padding: 3px 8px;
-            border-radius: 3px;
-            font-size: 0.85rem;
-            font-weight: bold;
-        }}
-        .badge-critical {{ background: #d32f2f; color: white; }}
-        .badge-high {{ background: #f57c00; color: white; }}
-        .badge-medium {{ background: #fbc02d; color: black; }}
-        .badge-low {{ background: #388e3c; color: white; }}
-    </style>
-</head>
-<body>
+        parts = []
+        self.write_html(review_data, parts.append)
+        return ''.join(parts)
+    
+    def write_html(self, review_data: Dict, write: Callable[[str], object]):
+        """
+        Write an HTML format report piece by piece
+        
+        Args:
+            review_data: Review results dictionary
+            write: Called with each successive chunk of the report (e.g. a file's write)
+        """
+        issues = review_data.get('issues') or _EMPTY_DICT
+        
+        write(HTML_HEAD)
+        write(f"""<body>
     <div class="header">
         <h1>🔍 Code Review Report</h1>
         <p><strong>Generated:</strong> {self.timestamp}</p>
-        <div class="grade">Grade: {review_data.get('grade', 'N/A')}</div>
-        <p><strong>Total Issues:</strong> {self._count_total_issues(review_data.get('issues', {}))}</p>
+        <div class="grade">Grade: {escape(str(review_data.get('grade', 'N/A')))}</div>
+        <p><strong>Total Issues:</strong> {self._count_total_issues(issues)}</p>
     </div>
     
     <div class="summary">
         <h2>Executive Summary</h2>
-        <p>{review_data.get('summary', 'No summary available')}</p>
+        <p>{escape(str(review_data.get('summary', 'No summary available')))}</p>
     </div>
-"""
+""")
         
         # Issues sections
-        issues = review_data.get('issues', {})
-        
-        for severity, color in [('critical', 'critical'), ('high', 'high'), ('medium', 'medium'), ('low', 'low')]:
-            severity_issues = issues.get(severity, [])
-            emoji = {'critical': '🔴', 'high': '🟡', 'medium': '🟠', 'low': '💡'}[severity]
+        for severity, section_open, empty_note in HTML_SECTIONS:
+            severity_issues = issues.get(severity, _EMPTY)
             
-            html += f"""
-    <div class="issue-section {color}">
-        <h2>{emoji} {severity.title()} Issues ({len(severity_issues)})</h2>
-"""
+            write(f"{section_open}{len(severity_issues)})</h2>\n")
             
             if severity_issues:
-                for issue in severity_issues[:10]:  # Limit to 10 per section
-                    html += self._format_issue_html(issue, severity)
+                for issue in severity_issues[:HTML_ISSUE_LIMIT]:
+                    write(self._format_issue_html(issue, severity))
             else:
-                html += f"<p>No {severity} priority issues found.</p>"
+                write(empty_note)
             
-            html += "    </div>\n"
+            write("    </div>\n")
         
         # Strengths
-        html += """
+        write("""
     <div class="issue-section">
         <h2>✅ Strengths</h2>
         <ul>
-"""
-        for strength in review_data.get('strengths', []):
-            html += f"            <li>{strength}</li>\n"
+""")
+        for strength in review_data.get('strengths', _EMPTY):
+            write(f"            <li>{escape(str(strength))}</li>\n")
         
-        html += """        </ul>
+        write("""        </ul>
     </div>
     
     <div class="issue-section">
         <h2>📋 Recommended Next Steps</h2>
         <ol>
-"""
-        for step in review_data.get('next_steps', []):
-            html += f"            <li>{step}</li>\n"
+""")
+        for step in review_data.get('next_steps', _EMPTY):
+            write(f"            <li>{escape(str(step))}</li>\n")
         
-        html += """        </ol>
-    </div>
-</body>
-</html>"""
-        
-        return html
+        write("        </ol>\n")
+        write(HTML_TAIL)
     
     def generate_json(self, review_data: Dict) -> str:
         """
@@ -272,24 +379,30 @@ class ReportGenerator:
         Returns:
             JSON formatted report
         """
+        issues = review_data.get('issues') or _EMPTY_DICT
+        critical_count = len(issues.get('critical', _EMPTY))
+        high_count = len(issues.get('high', _EMPTY))
+        medium_count = len(issues.get('medium', _EMPTY))
+        low_count = len(issues.get('low', _EMPTY))
+        
         report = {
             'timestamp': self.timestamp,
             'grade': review_data.get('grade', 'N/A'),
             'summary': review_data.get('summary', ''),
-            'issues': review_data.get('issues', {}),
-            'strengths': review_data.get('strengths', []),
-            'next_steps': review_data.get('next_steps', []),
-            'agent_feedback': review_data.get('agent_feedback', {}),
+            'issues': issues,
+            'strengths': review_data.get('strengths', _EMPTY),
+            'next_steps': review_data.get('next_steps', _EMPTY),
+            'agent_feedback': review_data.get('agent_feedback', _EMPTY_DICT),
             'metrics': {
-                'total_issues': self._count_total_issues(review_data.get('issues', {})),
-                'critical_count': len(review_data.get('issues', {}).get('critical', [])),
-                'high_count': len(review_data.get('issues', {}).get('high', [])),
-                'medium_count': len(review_data.get('issues', {}).get('medium', [])),
-                'low_count': len(review_data.get('issues', {}).get('low', []))
+                'total_issues': critical_count + high_count + medium_count + low_count,
+                'critical_count': critical_count,
+                'high_count': high_count,
+                'medium_count': medium_count,
+                'low_count': low_count
             }
         }
         
-        return json.dumps(report, indent=2)
+        return self._dumps(report)
     
     def generate_text(self, review_data: Dict) -> str:
         """
@@ -301,14 +414,28 @@ class ReportGenerator:
         Returns:
             Plain text formatted report
         """
-        text = f"""
+        parts = []
+        self.write_text(review_data, parts.append)
+        return ''.join(parts)
+    
+    def write_text(self, review_data: Dict, write: Callable[[str], object]):
+        """
+        Write a plain text format report piece by piece
+        
+        Args:
+            review_data: Review results dictionary
+            write: Called with each successive chunk of the report (e.g. a file's write)
+        """
+        issues = review_data.get('issues') or _EMPTY_DICT
+        
+        write(f"""
 {'='*80}
 CODE REVIEW REPORT
 {'='*80}
 
 Generated: {self.timestamp}
 Overall Grade: {review_data.get('grade', 'N/A')}
-Total Issues: {self._count_total_issues(review_data.get('issues', {}))}
+Total Issues: {self._count_total_issues(issues)}
 
 {'='*80}
 EXECUTIVE SUMMARY
@@ -320,118 +447,126 @@ EXECUTIVE SUMMARY
 ISSUES BY PRIORITY
 {'='*80}
 
-"""
+""")
         
         # Add issues
-        issues = review_data.get('issues', {})
-        
-        for severity in ['critical', 'high', 'medium', 'low']:
-            severity_issues = issues.get(severity, [])
-            text += f"\n{severity.upper()} PRIORITY ({len(severity_issues)} issues)\n"
-            text += "-" * 80 + "\n"
+        for severity in SEVERITIES:
+            severity_issues = issues.get(severity, _EMPTY)
+            write(f"\n{severity.upper()} PRIORITY ({len(severity_issues)} issues)\n")
+            write("-" * 80 + "\n")
             
             if severity_issues:
                 for i, issue in enumerate(severity_issues, 1):
-                    text += f"\n{i}. {issue.get('description', 'Issue')}\n"
+                    write(f"\n{i}. {issue.get('description', 'Issue')}\n")
                     if 'line' in issue:
-                        text += f"   Line: {issue['line']}\n"
+                        write(f"   Line: {issue['line']}\n")
                     if 'suggestion' in issue:
-                        text += f"   Fix: {issue['suggestion']}\n"
+                        write(f"   Fix: {issue['suggestion']}\n")
             else:
-                text += f"No {severity} priority issues.\n"
+                write(f"No {severity} priority issues.\n")
         
         # Strengths
-        text += f"\n{'='*80}\n"
-        text += "STRENGTHS\n"
-        text += "=" * 80 + "\n"
-        for strength in review_data.get('strengths', []):
-            text += f"✓ {strength}\n"
+        write(f"\n{'='*80}\n")
+        write("STRENGTHS\n")
+        write("=" * 80 + "\n")
+        for strength in review_data.get('strengths', _EMPTY):
+            write(f"✓ {strength}\n")
         
         # Next steps
-        text += f"\n{'='*80}\n"
-        text += "RECOMMENDED NEXT STEPS\n"
-        text += "=" * 80 + "\n"
-        for i, step in enumerate(review_data.get('next_steps', []), 1):
-            text += f"{i}. {step}\n"
-        
-        return text
+        write(f"\n{'='*80}\n")
+        write("RECOMMENDED NEXT STEPS\n")
+        write("=" * 80 + "\n")
+        for i, step in enumerate(review_data.get('next_steps', _EMPTY), 1):
+            write(f"{i}. {step}\n")
     
     # Helper methods
     
-    def _format_issue_markdown(self, number: int, issue: Dict) -> str:
-        """Format a single issue in Markdown"""
-        md = f"**{number}. {issue.get('description', 'Issue')}**\n"
-        
-        if 'line' in issue:
-            md += f"- **Line:** {issue['line']}\n"
-        
-        if 'source' in issue:
-            md += f"- **Detected by:** {issue['source']}\n"
-        
-        if 'severity' in issue:
-            md += f"- **Severity:** {issue['severity']}\n"
-        
-        if 'suggestion' in issue:
-            md += f"- **Fix:** {issue['suggestion']}\n"
-        
-        if 'code' in issue:
-            md += f"\n```python\n{issue['code']}\n```\n"
+    @staticmethod
+    def _dumps(obj) -> str:
+        """Serialize to indented JSON, with orjson when it is installed"""
+        if orjson is not None:
+            try:
+                text = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+            except TypeError:
+                # Values orjson can't encode (e.g. ints beyond 64 bits); let json decide
+                pass
+            else:
+                # orjson can't escape non-ASCII; json's \uXXXX output is kept for such reports
+                if text.isascii():
+                    return text
         
-        md += "\n"
-        return md
+        return json.dumps(obj, indent=2)
     
-    def _format_issue_html(self, issue: Dict, severity: str) -> str:
+    @staticmethod
+    def _format_issue_markdown(number: int, issue: Dict) -> str:
+        """Format a single issue in Markdown"""
+        get = issue.get
+        fields = (get('description', 'Issue'), get('line', _MISSING), get('source', _MISSING),
+                  get('severity', _MISSING), get('suggestion', _MISSING), get('code', _MISSING))
+        try:
+            body = _render_issue_markdown(*fields)
+        except TypeError:
+            # Unhashable field values can't be cached; render them directly
+            body = _render_issue_markdown.__wrapped__(*fields)
+        
+        return f"**{number}. {body}"
+    
+    @staticmethod
+    def _format_issue_html(issue: Dict, severity: str) -> str:
         """Format a single issue in HTML"""
-        html = f"""
-        <div class="issue">
-            <div class="issue-title">
-                <span class="badge badge-{severity}">{severity.upper()}</span>
-                {issue.get('description', 'Issue')}
-            </div>
-"""
-        
-        if 'line' in issue:
-            html += f"            <p><strong>Line:</strong> {issue['line']}</p>\n"
-        
-        if 'suggestion' in issue:
-            html += f"            <p><strong>Fix:</strong> {issue['suggestion']}</p>\n"
-        
-        if 'code' in issue:
-            html += f"            <div class='code-block'>{issue['code']}</div>\n"
-        
-        html += "        </div>\n"
-        return html
+        get = issue.get
+        fields = (severity, get('description', 'Issue'), get('line', _MISSING),
+                  get('suggestion', _MISSING), get('code', _MISSING))
+        try:
+            return _render_issue_html(*fields)
+        except TypeError:
+            # Unhashable field values can't be cached; render them directly
+            return _render_issue_html.__wrapped__(*fields)
     
-    def _count_total_issues(self, issues: Dict) -> int:
+    @staticmethod
+    def _count_total_issues(issues: Dict) -> int:
         """Count total issues across all severities"""
-        return sum(len(issues.get(severity, [])) for severity in ['critical', 'high', 'medium', 'low'])
+        return (len(issues.get('critical', _EMPTY)) + len(issues.get('high', _EMPTY)) +
+                len(issues.get('medium', _EMPTY)) + len(issues.get('low', _EMPTY)))
+
+
+# Report method for each format accepted by generate_report
+REPORT_FORMATS = {
+    'markdown': ReportGenerator.generate_markdown,
+    'html': ReportGenerator.generate_html,
+    'json': ReportGenerator.generate_json,
+    'text': ReportGenerator.generate_text,
+}
+
+# Formats save_report can stream straight to the file; the rest are written in one piece
+REPORT_WRITERS = {
+    'markdown': ReportGenerator.write_markdown,
+    'html': ReportGenerator.write_html,
+    'text': ReportGenerator.write_text,
+}
 
 
 # Convenience functions
 
-def generate_report(review_data: Dict, format: str = 'markdown') -> str:
+def generate_report(review_data: Dict, format: str = 'markdown',
+                    timestamp: Optional[str] = None) -> str:
     """
     Generate a report in the specified format
     
     Args:
         review_data: Review results dictionary
         format: Output format ('markdown', 'html', 'json', 'text')
+        timestamp: "Generated" time to stamp on the report (default: now)
     
     Returns:
         Formatted report string
     """
-    generator = ReportGenerator()
+    try:
+        generate = REPORT_FORMATS[format]
+    except KeyError:
+        raise ValueError(f"Unknown format: {format}. Use 'markdown', 'html', 'json', or 'text'") from None
     
-    if format == 'markdown':
-        return generator.generate_markdown(review_data)
-    elif format == 'html':
-        return generator.generate_html(review_data)
-    elif format == 'json':
-        return generator.generate_json(review_data)
-    elif format == 'text':
-        return generator.generate_text(review_data)
-    else:
-        raise ValueError(f"Unknown format: {format}. Use 'markdown', 'html', 'json', or 'text'")
+    return generate(ReportGenerator(timestamp), review_data)
 
 
 def save_report(review_data: Dict, filename: str, format: str = 'markdown'):
@@ -443,9 +578,22 @@ def save_report(review_data: Dict, filename: str, format: str = 'markdown'):
         filename: Output filename
         format: Output format
     """
-    report = generate_report(review_data, format)
+    # Written to a temp file beside the target and moved into place, so a writer
+    # that fails partway never leaves a truncated report behind
+    temp_filename = f"{filename}.{uuid.uuid4().hex[:8]}.tmp"
+    
+    with open(temp_filename, 'x', encoding='utf-8') as f:
+        try:
+            if format in REPORT_WRITERS:
+                # Render straight into the file rather than holding the whole report in memory
+                REPORT_WRITERS[format](ReportGenerator(), review_data, f.write)
+            else:
+                f.write(generate_report(review_data, format))
+        except BaseException:
+            f.close()
+            os.remove(temp_filename)
+            raise
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(report)
+    os.replace(temp_filename, filename)
     
     print(f"Report saved to {filename}")
\ No newline at end of file
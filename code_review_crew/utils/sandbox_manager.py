@@ -10,45 +10,172 @@ import tempfile
 import os
 import time
 import json
+import atexit
+import functools
+import hashlib
+import queue
+import threading
 from typing import Dict, Optional, List
 import uuid
+from collections import OrderedDict
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # One shared decoder instead of the lookup json.loads does per call
+    _json_loads = json.JSONDecoder().decode
+
+
+# Pre-started containers kept ready per (memory limit, network) configuration
+WARM_POOL_SIZE = 2
+
+# Hardening for every sandbox container, warm or one-shot (warm ones get it once at start
+# and every `docker exec` inherits it): read-only image layers, with a small tmpfs at /tmp
+# as the only writable place
+CONTAINER_HARDENING_ARGS = (
+    '--read-only',
+    '--tmpfs', '/tmp:rw,exec,size=64m',
+    '--workdir', '/tmp',
+    '--ulimit', 'nofile=256:256',
+    '--security-opt', 'no-new-privileges',
+)
+
+# Where a container's cgroup lives, per cgroup driver: systemd, then cgroupfs
+CGROUP_CONTAINER_DIRS = ('system.slice/docker-{}.scope', 'docker/{}')
+
+# Saves the code piped in on stdin as /tmp/code.py inside the container, then runs it
+PIPED_CODE_SCRIPT = 'cat > /tmp/code.py && exec python /tmp/code.py'
+
+# Runs inside one container for execute_batch: reads "<byte length>\n<code>" snippets
+# from stdin, runs each as /tmp/code.py in its own interpreter, and prints one JSON result
+# line per snippet. argv[1] is the per-snippet timeout in seconds.
+BATCH_RUNNER_SCRIPT = """
+import json, subprocess, sys, time
+timeout = float(sys.argv[1])
+while True:
+    header = sys.stdin.buffer.readline()
+    if not header:
+        break
+    with open('/tmp/code.py', 'wb') as f:
+        f.write(sys.stdin.buffer.read(int(header)))
+    start = time.time()
+    try:
+        proc = subprocess.run([sys.executable, '/tmp/code.py'], stdin=subprocess.DEVNULL,
+                              capture_output=True, timeout=timeout)
+        result = {'returncode': proc.returncode,
+                  'stdout': proc.stdout.decode('utf-8', 'replace'),
+                  'stderr': proc.stderr.decode('utf-8', 'replace')}
+    except subprocess.TimeoutExpired:
+        result = {'returncode': None}
+    result['execution_time'] = time.time() - start
+    sys.stdout.write(json.dumps(result) + '\\n')
+    sys.stdout.flush()
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _docker_available() -> bool:
+    """Check once per process whether Docker is installed and running"""
+    try:
+        result = subprocess.run(
+            ['docker', 'version'],
+            capture_output=True,
+            timeout=5
+        )
+        return result.returncode == 0
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return False
+
+
+def _decode_output(data: bytes) -> str:
+    """Decode captured process output, skipping the work when there is none"""
+    return data.decode('utf-8', 'replace') if data else ''
+
+
+def _timeout_error(timeout: int, stderr: str) -> str:
+    """Error text for a run stopped at its timeout, after any stderr it produced"""
+    message = f'Execution exceeded {timeout} seconds'
+    return f'{stderr.rstrip()}\n{message}' if stderr else message
+
+
+def _scratch_dir() -> str:
+    """Directory for short-lived code files: RAM-backed /dev/shm when usable, else the system temp dir"""
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return tempfile.gettempdir()
 
 
 class SandboxManager:
     """Manages Docker sandbox containers for code execution"""
     
-    def __init__(self, docker_image: str = "python:3.11-slim"):
+    def __init__(
+        self,
+        docker_image: str = "python:3.11-slim",
+        pool_size: int = WARM_POOL_SIZE,
+        prewarm: bool = False
+    ):
         """
         Initialize Sandbox Manager
         
         Args:
             docker_image: Docker image to use for sandbox
+            pool_size: Warm containers to keep ready per execute_code configuration (0 disables)
+            prewarm: Pull the image and warm the default-configuration pool in the background now,
+                instead of on the first execute_code call
         """
         self.docker_image = docker_image
-        self.temp_dir = tempfile.gettempdir()
+        self.temp_dir = _scratch_dir()
         self.active_containers = []
         
+        # Warm containers are started lazily, on the first execute_code call for a configuration
+        self.pool_size = pool_size
+        self._pools = {}
+        self._pool_lock = threading.Lock()
+        
+        # Successful execute_code(use_cache=True) results, keyed by code hash and limits,
+        # least recently used first
+        self._result_cache = OrderedDict()
+        self._result_cache_size = 256
+        self._result_cache_lock = threading.Lock()
+        
         # Check if Docker is available
         self.docker_available = self._check_docker()
+        
+        if prewarm and self.docker_available:
+            threading.Thread(target=self._prewarm, daemon=True).start()
     
-    def _check_docker(self) -> bool:
-        """Check if Docker is installed and running"""
+    def _prewarm(self):
+        """Pull the sandbox image if it isn't local yet, then warm the pool for execute_code's defaults"""
         try:
-            result = subprocess.run(
-                ['docker', 'version'],
+            present = subprocess.run(
+                ['docker', 'image', 'inspect', self.docker_image],
                 capture_output=True,
-                timeout=5
+                timeout=10
             )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+            if present.returncode != 0:
+                subprocess.run(
+                    ['docker', 'pull', self.docker_image],
+                    capture_output=True,
+                    timeout=300
+                )
+        except Exception:
+            # Best effort; execute_code pulls on demand anyway
+            pass
+        
+        self._take_warm_container("512m", False)
+    
+    def _check_docker(self) -> bool:
+        """Check if Docker is installed and running"""
+        return _docker_available()
     
     def execute_code(
         self,
         code: str,
         timeout: int = 30,
         memory_limit: str = "512m",
-        enable_network: bool = False
+        enable_network: bool = False,
+        use_cache: bool = False
     ) -> Dict:
         """
         Execute Python code in Docker sandbox
@@ -58,6 +185,9 @@ class SandboxManager:
             timeout: Maximum execution time in seconds
             memory_limit: Memory limit (e.g., "512m", "1g")
             enable_network: Whether to allow network access
+            use_cache: Reuse the result of an earlier successful run of the same code and
+                limits (LRU, keyed by a hash of both) instead of running it again. Only for
+                deterministic code: output and execution_time are those of the first run.
         
         Returns:
             {
@@ -77,72 +207,94 @@ class SandboxManager:
                 'memory_used': 0
             }
         
-        # Create temporary file for code
-        code_file = os.path.join(self.temp_dir, f'sandbox_{uuid.uuid4().hex}.py')
+        if not use_cache:
+            return self._run_code(code, timeout, memory_limit, enable_network)
+        
+        key = (
+            hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).digest(),
+            timeout, memory_limit, enable_network
+        )
+        with self._result_cache_lock:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                self._result_cache.move_to_end(key)
+                return dict(cached)
+        
+        result = self._run_code(code, timeout, memory_limit, enable_network)
+        
+        # Only successes are reused; errors and timeouts may be transient
+        if result['status'] == 'success':
+            with self._result_cache_lock:
+                self._result_cache[key] = dict(result)
+                if len(self._result_cache) > self._result_cache_size:
+                    self._result_cache.popitem(last=False)
+        
+        return result
+    
+    def _run_code(self, code: str, timeout: int, memory_limit: str, enable_network: bool) -> Dict:
+        """Run one snippet in a warm or fresh container, without consulting the result cache"""
+        container_id = self._take_warm_container(memory_limit, enable_network)
         
         try:
-            # Write code to file
-            with open(code_file, 'w') as f:
-                f.write(code)
-            
-            # Build Docker run command
-            docker_cmd = [
-                'docker', 'run',
-                '--rm',  # Remove container after execution
-                '--memory', memory_limit,
-                '--cpus', '1.0',  # Limit to 1 CPU
-                '--pids-limit', '100',  # Limit number of processes
-            ]
-            
-            # Disable network if requested
-            if not enable_network:
-                docker_cmd.extend(['--network', 'none'])
-            
-            # Mount code file
-            docker_cmd.extend([
-                '-v', f'{code_file}:/code.py:ro',  # Read-only mount
-                self.docker_image,
-                'python', '/code.py'
-            ])
+            # The code is piped in on stdin, so no temp file or bind mount is needed
+            if container_id is not None:
+                # Already running with the same limits
+                docker_cmd = ['docker', 'exec', '-i', container_id, 'sh', '-c', PIPED_CODE_SCRIPT]
+            else:
+                docker_cmd = [
+                    'docker', 'run',
+                    '--rm',  # Remove container after execution
+                    '-i',  # Keep stdin open for the code
+                    *self._limit_args(memory_limit, enable_network),
+                    self.docker_image,
+                    'sh', '-c', PIPED_CODE_SCRIPT
+                ]
             
             # Execute with timeout
             start_time = time.time()
             
+            proc = subprocess.Popen(
+                docker_cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+            
             try:
-                result = subprocess.run(
-                    docker_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout
-                )
-                
-                execution_time = time.time() - start_time
-                
-                if result.returncode == 0:
-                    return {
-                        'status': 'success',
-                        'output': result.stdout,
-                        'error': result.stderr,
-                        'execution_time': execution_time,
-                        'memory_used': self._get_memory_usage(result.stderr)
-                    }
-                else:
-                    return {
-                        'status': 'error',
-                        'output': result.stdout,
-                        'error': result.stderr,
-                        'execution_time': execution_time,
-                        'memory_used': 0
-                    }
+                stdout, stderr = proc.communicate(code.encode('utf-8'), timeout=timeout)
             
             except subprocess.TimeoutExpired:
+                # Keep whatever the snippet printed before it was stopped
+                proc.kill()
+                stdout, stderr = proc.communicate()
                 return {
                     'status': 'timeout',
-                    'output': '',
-                    'error': f'Execution exceeded {timeout} seconds',
+                    'output': _decode_output(stdout),
+                    'error': _timeout_error(timeout, _decode_output(stderr)),
                     'execution_time': timeout,
                     'memory_used': 0
                 }
+            
+            execution_time = time.time() - start_time
+            stdout = _decode_output(stdout)
+            stderr = _decode_output(stderr)
+            
+            if proc.returncode == 0:
+                return {
+                    'status': 'success',
+                    'output': stdout,
+                    'error': stderr,
+                    'execution_time': execution_time,
+                    'memory_used': self._get_memory_usage(stderr)
+                }
+            else:
+                return {
+                    'status': 'error',
+                    'output': stdout,
+                    'error': stderr,
+                    'execution_time': execution_time,
+                    'memory_used': 0
+                }
         
         except Exception as e:
             return {
@@ -154,9 +306,216 @@ class SandboxManager:
             }
         
         finally:
-            # Clean up temporary file
-            if os.path.exists(code_file):
-                os.remove(code_file)
+            # Warm containers run a single snippet, so no state leaks between executions
+            if container_id is not None:
+                threading.Thread(target=self.cleanup_container, args=(container_id,), daemon=True).start()
+    
+    def execute_batch(
+        self,
+        codes: List[str],
+        timeout: int = 30,
+        memory_limit: str = "512m",
+        enable_network: bool = False
+    ) -> List[Dict]:
+        """
+        Execute several Python snippets in a single Docker sandbox
+        
+        Pays for one container and one docker call for the whole batch instead
+        of one per snippet. Each snippet still runs in its own interpreter, but
+        they share the container, so files one snippet writes are visible to
+        the snippets after it; use execute_code for mutually untrusted code.
+        
+        Args:
+            codes: Python code snippets to execute, in order
+            timeout: Maximum execution time per snippet in seconds
+            memory_limit: Memory limit for the whole batch (e.g., "512m", "1g")
+            enable_network: Whether to allow network access
+        
+        Returns:
+            One execute_code-style result dict per snippet, in order
+        """
+        if not self.docker_available:
+            return [{
+                'status': 'error',
+                'output': '',
+                'error': 'Docker is not available',
+                'execution_time': 0,
+                'memory_used': 0
+            } for _ in codes]
+        
+        if not codes:
+            return []
+        
+        runner_cmd = ['python', '-c', BATCH_RUNNER_SCRIPT, str(timeout)]
+        container_id = self._take_warm_container(memory_limit, enable_network)
+        
+        if container_id is not None:
+            docker_cmd = ['docker', 'exec', '-i', container_id, *runner_cmd]
+        else:
+            docker_cmd = [
+                'docker', 'run',
+                '--rm',  # Remove container after execution
+                '-i',  # Keep stdin open for the snippets
+                *self._limit_args(memory_limit, enable_network),
+                self.docker_image,
+                *runner_cmd
+            ]
+        
+        payload = []
+        for code in codes:
+            data = code.encode('utf-8')
+            payload.append(b'%d\n' % len(data))
+            payload.append(data)
+        
+        # What snippets that never report back get (runner killed or batch deadline hit)
+        missing_status = 'error'
+        missing_error = 'Sandbox stopped before this snippet finished'
+        
+        try:
+            result = subprocess.run(
+                docker_cmd,
+                input=b''.join(payload),
+                capture_output=True,
+                timeout=timeout * len(codes) + 30  # Headroom for container startup
+            )
+            stdout = result.stdout
+            if result.returncode != 0:
+                missing_error = result.stderr.decode('utf-8', 'replace') or missing_error
+        
+        except subprocess.TimeoutExpired as e:
+            stdout = e.stdout or b''
+            missing_status = 'timeout'
+            missing_error = f'Batch exceeded {timeout * len(codes) + 30} seconds'
+        
+        except Exception as e:
+            stdout = b''
+            missing_error = str(e)
+        
+        finally:
+            # Warm containers run a single batch, so no state leaks between executions
+            if container_id is not None:
+                threading.Thread(target=self.cleanup_container, args=(container_id,), daemon=True).start()
+        
+        results = []
+        for line in stdout.decode('utf-8', 'replace').splitlines()[:len(codes)]:
+            try:
+                reported = _json_loads(line)
+            except ValueError:
+                # A partial line cut off mid-write
+                break
+            
+            if reported['returncode'] is None:
+                results.append({
+                    'status': 'timeout',
+                    'output': '',
+                    'error': f'Execution exceeded {timeout} seconds',
+                    'execution_time': timeout,
+                    'memory_used': 0
+                })
+            else:
+                results.append({
+                    'status': 'success' if reported['returncode'] == 0 else 'error',
+                    'output': reported['stdout'],
+                    'error': reported['stderr'],
+                    'execution_time': reported['execution_time'],
+                    'memory_used': 0
+                })
+        
+        for _ in range(len(codes) - len(results)):
+            results.append({
+                'status': missing_status,
+                'output': '',
+                'error': missing_error,
+                'execution_time': 0,
+                'memory_used': 0
+            })
+        
+        return results
+    
+    def _limit_args(self, memory_limit: str, enable_network: bool) -> List[str]:
+        """Resource, network and hardening limits shared by one-shot and warm containers"""
+        args = [
+            '--memory', memory_limit,
+            '--cpus', '1.0',  # Limit to 1 CPU
+            '--pids-limit', '100',  # Limit number of processes
+            *CONTAINER_HARDENING_ARGS,
+        ]
+        
+        # Disable network if requested
+        if not enable_network:
+            args.extend(['--network', 'none'])
+        
+        return args
+    
+    def _take_warm_container(self, memory_limit: str, enable_network: bool) -> Optional[str]:
+        """
+        Take a pre-started container for this configuration, if one is ready
+        
+        Every container taken is replaced in the background. The first call for a
+        configuration only starts warming its pool and returns None, as does any
+        call that finds the pool empty; callers then fall back to a one-shot run.
+        
+        Args:
+            memory_limit: Memory limit of the container
+            enable_network: Whether the container has network access
+        
+        Returns:
+            Container ID, or None if no warm container is ready
+        """
+        if self.pool_size <= 0:
+            return None
+        
+        key = (memory_limit, enable_network)
+        
+        with self._pool_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = queue.Queue()
+                if len(self._pools) == 1:
+                    atexit.register(self.cleanup_all)
+                refills = self.pool_size
+            else:
+                refills = 0
+        
+        container_id = None
+        if not refills:
+            try:
+                container_id = pool.get_nowait()
+                refills = 1
+            except queue.Empty:
+                # Replacements are still starting; don't pile more on
+                pass
+        
+        for _ in range(refills):
+            threading.Thread(target=self._start_warm_container, args=(key, pool), daemon=True).start()
+        
+        return container_id
+    
+    def _start_warm_container(self, key: tuple, pool: queue.Queue):
+        """Start one idle container with the given limits and add it to its pool"""
+        memory_limit, enable_network = key
+        
+        try:
+            result = subprocess.run(
+                [
+                    'docker', 'run', '-d', '--rm',
+                    *self._limit_args(memory_limit, enable_network),
+                    '--name', f'sandbox_pool_{uuid.uuid4().hex[:8]}',
+                    self.docker_image,
+                    'tail', '-f', '/dev/null'
+                ],
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+        except Exception:
+            return
+        
+        # A failed start is not retried; the pool just runs one container short
+        if result.returncode == 0:
+            container_id = result.stdout.strip()
+            self.active_containers.append(container_id)
+            pool.put(container_id)
     
     def execute_with_input(
         self,
@@ -192,6 +551,7 @@ class SandboxManager:
                 'docker', 'run', '--rm',
                 '--memory', '512m',
                 '--network', 'none',
+                *CONTAINER_HARDENING_ARGS,
                 '-i',  # Interactive mode for stdin
                 '-v', f'{code_file}:/code.py:ro',
                 self.docker_image,
@@ -200,34 +560,41 @@ class SandboxManager:
             
             start_time = time.time()
             
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 docker_cmd,
-                input=stdin_input,
-                capture_output=True,
-                text=True,
-                timeout=timeout
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
             )
             
+            try:
+                stdout, stderr = proc.communicate(stdin_input.encode('utf-8'), timeout=timeout)
+            
+            except subprocess.TimeoutExpired:
+                # Keep whatever the code printed before it was stopped
+                proc.kill()
+                stdout, stderr = proc.communicate()
+                return {
+                    'status': 'timeout',
+                    'output': _decode_output(stdout),
+                    'error': _timeout_error(timeout, _decode_output(stderr)),
+                    'execution_time': timeout
+                }
+            
             execution_time = time.time() - start_time
             
             return {
-                'status': 'success' if result.returncode == 0 else 'error',
-                'output': result.stdout,
-                'error': result.stderr,
+                'status': 'success' if proc.returncode == 0 else 'error',
+                'output': _decode_output(stdout),
+                'error': _decode_output(stderr),
                 'execution_time': execution_time
             }
         
-        except subprocess.TimeoutExpired:
-            return {
-                'status': 'timeout',
-                'output': '',
-                'error': f'Execution exceeded {timeout} seconds',
-                'execution_time': timeout
-            }
-        
         finally:
-            if os.path.exists(code_file):
-                os.remove(code_file)
+            try:
+                os.unlink(code_file)
+            except FileNotFoundError:
+                pass
     
     def create_persistent_container(
         self,
@@ -340,13 +707,64 @@ class SandboxManager:
             )
             
             if result.returncode == 0:
-                return json.loads(result.stdout)
+                return _json_loads(result.stdout)
             
             return {}
         
         except Exception:
             return {}
     
+    def get_container_usage(self, container_id: str) -> Dict:
+        """
+        Read a container's resource usage straight from its cgroup
+        
+        Much cheaper than get_container_stats, which forks the docker CLI and
+        formats its numbers for display, so it suits polling loops. Only works
+        with a local Linux daemon and a full container ID (as returned by
+        create_persistent_container); otherwise returns {}.
+        
+        Args:
+            container_id: Full container ID
+        
+        Returns:
+            {
+                'memory_bytes': int,
+                'cpu_usec': int,
+                'pids': int
+            }
+        """
+        for template in CGROUP_CONTAINER_DIRS:
+            container_dir = template.format(container_id)
+            
+            try:
+                # cgroup v2: one unified hierarchy
+                base = os.path.join('/sys/fs/cgroup', container_dir)
+                with open(os.path.join(base, 'memory.current')) as f:
+                    memory_bytes = int(f.read())
+                with open(os.path.join(base, 'cpu.stat')) as f:
+                    cpu_usec = int(f.readline().split()[1])  # usage_usec comes first
+                with open(os.path.join(base, 'pids.current')) as f:
+                    pids = int(f.read())
+            except (OSError, ValueError, IndexError):
+                try:
+                    # cgroup v1: one hierarchy per controller
+                    with open(os.path.join('/sys/fs/cgroup/memory', container_dir, 'memory.usage_in_bytes')) as f:
+                        memory_bytes = int(f.read())
+                    with open(os.path.join('/sys/fs/cgroup/cpuacct', container_dir, 'cpuacct.usage')) as f:
+                        cpu_usec = int(f.read()) // 1000
+                    with open(os.path.join('/sys/fs/cgroup/pids', container_dir, 'pids.current')) as f:
+                        pids = int(f.read())
+                except (OSError, ValueError):
+                    continue
+            
+            return {
+                'memory_bytes': memory_bytes,
+                'cpu_usec': cpu_usec,
+                'pids': pids
+            }
+        
+        return {}
+    
     def _get_memory_usage(self, stderr: str) -> int:
         """Extract memory usage from stderr if available"""
         # This is a placeholder - actual implementation would parse Docker stats
@@ -368,26 +786,37 @@ class SandboxManager:
                 'error': 'Docker is not available'
             }
         
-        # Create temporary Dockerfile
+        # Sorted, so the same package set always produces the same Dockerfile and tag
         dockerfile_content = f"""
 FROM {self.docker_image}
-RUN pip install --no-cache-dir {' '.join(packages)}
+RUN pip install --no-cache-dir {' '.join(sorted(packages))}
 """
         
-        dockerfile_path = os.path.join(self.temp_dir, f'Dockerfile.{uuid.uuid4().hex}')
-        image_name = f'sandbox_custom_{uuid.uuid4().hex[:8]}'
+        digest = hashlib.sha256(dockerfile_content.encode('utf-8')).hexdigest()
+        image_name = f'sandbox_custom_{digest[:12]}'
         
         try:
-            # Write Dockerfile
-            with open(dockerfile_path, 'w') as f:
-                f.write(dockerfile_content)
+            # An image for this exact package set was built before; reuse it
+            existing = subprocess.run(
+                ['docker', 'image', 'inspect', image_name],
+                capture_output=True,
+                timeout=10
+            )
+            if existing.returncode == 0:
+                return {
+                    'status': 'success',
+                    'image_name': image_name,
+                    'packages': packages
+                }
             
-            # Build image
+            # Build image; the Dockerfile comes in on stdin, so no build context is sent
             result = subprocess.run(
-                ['docker', 'build', '-t', image_name, '-f', dockerfile_path, self.temp_dir],
+                ['docker', 'build', '-t', image_name, '-'],
+                input=dockerfile_content,
                 capture_output=True,
                 text=True,
-                timeout=300  # 5 minutes for build
+                timeout=300,  # 5 minutes for build
+                env={**os.environ, 'DOCKER_BUILDKIT': '1'}
             )
             
             if result.returncode == 0:
@@ -407,10 +836,6 @@ RUN pip install --no-cache-dir {' '.join(packages)}
                 'status': 'error',
                 'error': str(e)
             }
-        
-        finally:
-            if os.path.exists(dockerfile_path):
-                os.remove(dockerfile_path)
 
 
 class MockSandboxManager:
@@ -420,16 +845,17 @@ class MockSandboxManager:
     """
     
     def __init__(self):
-        self.temp_dir = tempfile.gettempdir()
+        self.temp_dir = _scratch_dir()
     
     def execute_code(
         self,
         code: str,
         timeout: int = 30,
         memory_limit: str = "512m",
-        enable_network: bool = False
+        enable_network: bool = False,
+        use_cache: bool = False
     ) -> Dict:
-        """Execute code using subprocess (UNSAFE - for testing only)"""
+        """Execute code using subprocess (UNSAFE - for testing only; use_cache is ignored)"""
         
         code_file = os.path.join(self.temp_dir, f'mock_sandbox_{uuid.uuid4().hex}.py')
         
@@ -442,7 +868,6 @@ class MockSandboxManager:
             result = subprocess.run(
                 ['python', code_file],
                 capture_output=True,
-                text=True,
                 timeout=timeout
             )
             
@@ -450,8 +875,8 @@ class MockSandboxManager:
             
             return {
                 'status': 'success' if result.returncode == 0 else 'error',
-                'output': result.stdout,
-                'error': result.stderr,
+                'output': _decode_output(result.stdout),
+                'error': _decode_output(result.stderr),
                 'execution_time': execution_time,
                 'memory_used': 0,
                 'warning': 'Using mock sandbox without Docker isolation'
@@ -476,8 +901,10 @@ class MockSandboxManager:
             }
         
         finally:
-            if os.path.exists(code_file):
-                os.remove(code_file)
+            try:
+                os.unlink(code_file)
+            except FileNotFoundError:
+                pass
 
 
 # Convenience function
@@ -492,10 +919,8 @@ def get_sandbox_manager(use_docker: bool = True) -> object:
     Returns:
         SandboxManager or MockSandboxManager
     """
-    if use_docker:
-        manager = SandboxManager()
-        if manager.docker_available:
-            return manager
+    if use_docker and _docker_available():
+        return SandboxManager()
     
     print("Warning: Docker not available, using mock sandbox (unsafe)")
     return MockSandboxManager()
\ No newline at end of file
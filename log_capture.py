@@ -5,26 +5,144 @@ Captures console output for display in Streamlit
 """
 
 import sys
-from io import StringIO
+import threading
+from collections import deque
+from contextvars import ContextVar
+from io import TextIOBase
 from contextlib import contextmanager
+from typing import Optional
+
+
+# Most recent output LogCapture keeps, in characters; older output is dropped
+LOG_BUFFER_MAX_CHARS = 4 << 20
+
+
+class ChunkBuffer(TextIOBase):
+    """Text stream that keeps each write as a separate chunk, joined only when read"""
+    
+    def __init__(self, max_chars: Optional[int] = None):
+        """
+        Initialize the buffer
+        
+        Args:
+            max_chars: Drop the oldest chunks once the total exceeds this (None keeps everything)
+        """
+        self.chunks = deque()
+        self.max_chars = max_chars
+        self.size = 0  # Only tracked when max_chars is set
+        # Worker threads without a capture of their own write here too (see _StdoutRouter),
+        # so size and chunks are only changed together under this lock
+        self.lock = threading.Lock()
+        
+        if max_chars is None:
+            # Bound deque.append, so print() writes without a Python-level call;
+            # a single append is atomic and there is no size to keep in step
+            self.write = self.chunks.append
+    
+    def write(self, s):
+        """Append a chunk, dropping the oldest ones while over max_chars"""
+        with self.lock:
+            chunks = self.chunks
+            chunks.append(s)
+            self.size += len(s)
+            
+            # Always keep the newest chunk, even if it alone is over the limit
+            while self.size > self.max_chars and len(chunks) > 1:
+                self.size -= len(chunks.popleft())
+        
+        return len(s)
+    
+    def writable(self):
+        return True
+    
+    def getvalue(self):
+        """Return everything written so far"""
+        with self.lock:
+            return ''.join(self.chunks)
+    
+    def clear(self):
+        """Drop everything written so far"""
+        with self.lock:
+            self.chunks.clear()
+            self.size = 0
+
+
+# Buffer of the capture started in the current thread or async task, if any
+_current_buffer: ContextVar[Optional[ChunkBuffer]] = ContextVar('log_capture_buffer', default=None)
+
+# The installed _StdoutRouter, while any capture is running
+_router = None
+_router_lock = threading.Lock()
+
+
+class _StdoutRouter(TextIOBase):
+    """sys.stdout stand-in that sends each write to the capture of the writing context"""
+    
+    def __init__(self, target):
+        self.target = target
+        self.active = []  # Buffers of running captures, oldest first
+    
+    def write(self, s):
+        buffer = _current_buffer.get()
+        if buffer is None:
+            # Threads without a capture of their own (e.g. agent worker threads) go to
+            # the newest running capture, as they did when captures swapped sys.stdout
+            active = self.active
+            buffer = active[-1] if active else self.target
+        return buffer.write(s)
+    
+    def writable(self):
+        return True
 
 
 class LogCapture:
     """Captures print statements to a string buffer"""
     
-    def __init__(self):
-        self.buffer = StringIO()
+    def __init__(self, max_chars: Optional[int] = LOG_BUFFER_MAX_CHARS):
+        """
+        Initialize log capture
+        
+        Args:
+            max_chars: Most recent output to keep, in characters (None keeps everything)
+        """
+        self.buffer = ChunkBuffer(max_chars)
         self.original_stdout = None
+        self._router = None
+        self._previous_buffer = None
     
     def start(self):
-        """Start capturing stdout"""
-        self.original_stdout = sys.stdout
-        sys.stdout = self.buffer
+        """
+        Start capturing stdout
+        
+        Concurrent captures in different threads or async tasks each get their
+        own context's output; sys.stdout is only swapped while any are running.
+        """
+        global _router
+        
+        with _router_lock:
+            if _router is None or sys.stdout is not _router:
+                _router = _StdoutRouter(sys.stdout)
+                sys.stdout = _router
+            _router.active.append(self.buffer)
+            self._router = _router
+        
+        self.original_stdout = self._router.target
+        self._previous_buffer = _current_buffer.get()
+        _current_buffer.set(self.buffer)
     
     def stop(self):
         """Stop capturing and return to original stdout"""
-        if self.original_stdout:
-            sys.stdout = self.original_stdout
+        router = self._router
+        if router is not None:
+            _current_buffer.set(self._previous_buffer)
+            
+            with _router_lock:
+                router.active.remove(self.buffer)
+                if not router.active and sys.stdout is router:
+                    sys.stdout = router.target
+            
+            self._router = None
+        
         return self.buffer.getvalue()
     
     def get_logs(self):
@@ -33,21 +151,25 @@ class LogCapture:
     
     def clear(self):
         """Clear the buffer"""
-        self.buffer = StringIO()
+        # In place, so a capture that is still running keeps writing into it
+        self.buffer.clear()
 
 
 @contextmanager
-def capture_logs():
+def capture_logs(max_chars: Optional[int] = LOG_BUFFER_MAX_CHARS):
     """
     Context manager for log capture
     
+    Args:
+        max_chars: Most recent output to keep, in characters (None keeps everything)
+    
     Usage:
         with capture_logs() as capturer:
             print("This will be captured")
             # Do work
         logs = capturer.get_logs()
     """
-    capturer = LogCapture()
+    capturer = LogCapture(max_chars)
     capturer.start()
     try:
         yield capturer
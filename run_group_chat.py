@@ -4,10 +4,14 @@ AutoGen Group Chat Runner for Code Review Crew
 This module orchestrates the multi-agent code review system using custom agent classes.
 """
 
+import asyncio
+import hashlib
 import os
 import sys
 import autogen
-from typing import Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -34,16 +38,66 @@ except ImportError as e:
     AGENTS_AVAILABLE = False
 
 
+# Specialists whose analyses don't depend on each other, consulted concurrently in a parallel review
+PARALLEL_SPECIALISTS = ('code_analyzer', 'security', 'performance', 'test_generator')
+
+# Tool-call rounds a specialist gets in a parallel review before it must answer
+PARALLEL_TOOL_ROUNDS = 5
+
+# Retries the OpenAI client makes on rate limits (429), timeouts and 5xx, with exponential backoff
+LLM_MAX_RETRIES = 5
+
+# Group chat speaking order after the user's request: each specialist reports once, then the
+# orchestrator synthesizes (picked by CodeReviewChat._next_speaker, with no LLM call per turn)
+REVIEW_SPEAKER_ORDER = (*PARALLEL_SPECIALISTS, 'orchestrator')
+
+# Agent chats a parallel review keeps in flight at once
+LLM_MAX_CONCURRENCY = 4
+
+# Finished reviews kept per CodeReviewChat, so identical code isn't reviewed twice
+REVIEW_CACHE_SIZE = 32
+
+# Seconds a streamed review waits between checks for new messages
+STREAM_POLL_INTERVAL = 0.1
+
+# Model for the specialists that list issues in a fixed format (analyzer, security, performance);
+# they run at temperature 0, while the orchestrator and chat manager keep the main model
+SPECIALIST_MODEL = "gpt-4o-mini"
+
+
 class CodeReviewChat:
     """Main class to run AutoGen group chat code reviews using custom agent classes"""
     
-    def __init__(self, api_key: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        max_retries: int = LLM_MAX_RETRIES,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        cache_size: int = REVIEW_CACHE_SIZE,
+        specialist_model: str = SPECIALIST_MODEL
+    ):
+        """
+        Args:
+            api_key: OpenAI API key (defaults to OPENAI_API_KEY)
+            max_retries: Retries per LLM request on 429s, timeouts and server errors;
+                the client backs off exponentially and honors Retry-After
+            max_concurrency: Most agent chats a parallel review runs at once
+            cache_size: Finished reviews to remember by code hash (0 disables)
+            specialist_model: Model for CodeAnalyzer, SecurityReviewer and PerformanceOptimizer
+        """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.max_concurrency = max(1, max_concurrency)
         
         self.llm_config = {
             "model": "gpt-4",
             "temperature": 0.7,
-            "api_key": self.api_key
+            "api_key": self.api_key,
+            "max_retries": max_retries  # Passed through to the OpenAI client
+        }
+        self.specialist_llm_config = {
+            **self.llm_config,
+            "model": specialist_model,
+            "temperature": 0.0
         }
         
         # Initialize tools
@@ -61,6 +115,11 @@ class CodeReviewChat:
         self.agent_instances = {}  # Store our custom agent class instances
         self.group_chat = None
         self.chat_manager = None
+        self._initialized = False  # Agents, tools and group chat are built on the first review
+        
+        # Messages of finished reviews, keyed by code hash and mode, least recently used first
+        self._review_cache = OrderedDict()
+        self._review_cache_size = cache_size
         
     def create_agents(self):
         """Create all agents using custom agent classes"""
@@ -72,9 +131,9 @@ class CodeReviewChat:
         
         # Create custom agent instances
         self.agent_instances['orchestrator'] = ReviewOrchestrator(self.llm_config)
-        self.agent_instances['code_analyzer'] = CodeAnalyzer(self.llm_config, self.tools)
-        self.agent_instances['security'] = SecurityReviewer(self.llm_config, self.tools)
-        self.agent_instances['performance'] = PerformanceOptimizer(self.llm_config, self.tools)
+        self.agent_instances['code_analyzer'] = CodeAnalyzer(self.specialist_llm_config, self.tools)
+        self.agent_instances['security'] = SecurityReviewer(self.specialist_llm_config, self.tools)
+        self.agent_instances['performance'] = PerformanceOptimizer(self.specialist_llm_config, self.tools)
         self.agent_instances['test_generator'] = TestGenerator(self.llm_config, self.tools)
         self.agent_instances['code_executor'] = CodeExecutor(self.llm_config, self.tools)
         
@@ -103,12 +162,10 @@ class CodeReviewChat:
         self.agents['orchestrator'] = autogen.AssistantAgent(
             name="ReviewOrchestrator",
             system_message="""You coordinate the code review. 
-            1. Start by asking CodeAnalyzer for analysis
-            2. Then SecurityReviewer for security check
-            3. Then PerformanceOptimizer for performance review
-            4. Then TestGenerator for test suggestions
-            5. Synthesize final report with grades (A-F)
-            6. List issues by priority: Critical, High, Medium, Low""",
+            CodeAnalyzer, SecurityReviewer, PerformanceOptimizer and TestGenerator
+            report first, in that order; you speak last.
+            1. Synthesize final report with grades (A-F)
+            2. List issues by priority: Critical, High, Medium, Low""",
             llm_config=self.llm_config
         )
         
@@ -116,7 +173,7 @@ class CodeReviewChat:
             name="CodeAnalyzer",
             system_message="""You analyze code quality.
             Report: style issues, bugs, code smells with line numbers.""",
-            llm_config=self.llm_config
+            llm_config=self.specialist_llm_config
         )
         
         self.agents['security'] = autogen.AssistantAgent(
@@ -124,14 +181,14 @@ class CodeReviewChat:
             system_message="""You find security vulnerabilities.
             Check for: SQL injection, XSS, weak crypto, hardcoded secrets.
             Mark all security issues as CRITICAL.""",
-            llm_config=self.llm_config
+            llm_config=self.specialist_llm_config
         )
         
         self.agents['performance'] = autogen.AssistantAgent(
             name="PerformanceOptimizer",
             system_message="""You analyze performance.
             Report: nested loops, O(n²) issues, caching opportunities.""",
-            llm_config=self.llm_config
+            llm_config=self.specialist_llm_config
         )
         
         self.agents['test_generator'] = autogen.AssistantAgent(
@@ -194,7 +251,7 @@ class CodeReviewChat:
             agents=agent_list,
             messages=[],
             max_round=20,
-            speaker_selection_method="auto"
+            speaker_selection_method=self._next_speaker
         )
         
         self.chat_manager = autogen.GroupChatManager(
@@ -204,54 +261,407 @@ class CodeReviewChat:
         
         print("✅ Setup group chat with 7 agents (6 specialists + 1 user)")
     
-    def review_code(self, code: str) -> Dict:
+    def _next_speaker(self, last_speaker, groupchat):
+        """
+        Pick the next group chat speaker from REVIEW_SPEAKER_ORDER
+        
+        Args:
+            last_speaker: Agent that spoke last
+            groupchat: The group chat
+        
+        Returns:
+            Next agent, or None to end the chat after the orchestrator's synthesis
+        """
+        last = groupchat.messages[-1] if groupchat.messages else {}
+        
+        # Agents run their own tools: the caller executes its call, then reads the result
+        if last.get('function_call') or last.get('tool_calls') or last.get('role') in ('function', 'tool'):
+            return last_speaker
+        
+        order = [self.agents[name] for name in REVIEW_SPEAKER_ORDER]
+        if last_speaker is self.agents['user']:
+            return order[0]
+        if last_speaker not in order:
+            return None
+        
+        i = order.index(last_speaker)
+        return order[i + 1] if i + 1 < len(order) else None
+    
+    def review_code(self, code: str, parallel: bool = False, include_full: bool = True) -> Dict:
         """
         Run comprehensive code review using multi-agent system
         
         Args:
             code: Python source code to review
+            parallel: Consult the specialists concurrently and have the orchestrator
+                synthesize their reports, instead of taking turns in the group chat
+            include_full: Also return the raw chat messages (tool calls and all) under 'messages';
+                callers that only read 'conversation' can pass False to skip the copy
+        
+        Returns:
+            Dictionary containing review results and conversation history, whether
+            the review came from the cache ('cached') and the tokens it spent per
+            model ('usage', empty when cached)
+        """
+        key = self._review_cache_key(code, parallel)
+        messages = self._review_cache_get(key)
+        cached = messages is not None
+        usage = {}
+        
+        if not cached:
+            message = self._start_review(code)
+            
+            if parallel:
+                messages = self._review_in_parallel(code)
+            else:
+                # Run chat
+                self.agents['user'].initiate_chat(
+                    self.chat_manager,
+                    message=message
+                )
+                # Copied, since the next review clears the group chat's list in place
+                messages = list(self.group_chat.messages)
+            
+            usage = self._review_usage()
+            self._review_cache_put(key, messages)
+        
+        return self._finish_review(messages, include_full, cached, usage)
+    
+    async def a_review_code(self, code: str, parallel: bool = False, include_full: bool = True) -> Dict:
+        """
+        Async version of review_code, for callers already running an event loop
+        
+        The group chat runs through AutoGen's async API, so awaiting the review
+        doesn't hold a thread while the agents wait on the LLM.
+        
+        Args:
+            code: Python source code to review
+            parallel: Consult the specialists concurrently (see review_code)
+            include_full: Also return the raw chat messages under 'messages'
         
         Returns:
-            Dictionary containing review results and conversation history
+            Dictionary containing review results and conversation history, plus
+            'cached' and 'usage' as in review_code
+        """
+        key = self._review_cache_key(code, parallel)
+        messages = self._review_cache_get(key)
+        cached = messages is not None
+        usage = {}
+        
+        if not cached:
+            message = self._start_review(code)
+            
+            if parallel:
+                messages = await self._a_review_in_parallel(code)
+            else:
+                await self.agents['user'].a_initiate_chat(
+                    self.chat_manager,
+                    message=message
+                )
+                messages = list(self.group_chat.messages)
+            
+            usage = self._review_usage()
+            self._review_cache_put(key, messages)
+        
+        return self._finish_review(messages, include_full, cached, usage)
+    
+    async def a_review_code_stream(self, code: str, parallel: bool = False) -> AsyncIterator[Dict]:
         """
+        Review code like a_review_code, yielding each message as soon as an agent finishes it
+        
+        AutoGen's 0.2 agents have no hook for token deltas, so this streams whole messages:
+        a UI can show the first report while the other agents are still working.
+        
+        Args:
+            code: Python source code to review
+            parallel: Consult the specialists concurrently (see review_code); their
+                reports then arrive in the order they finish
+        
+        Yields:
+            {'speaker': str, 'content': str} for each conversation message
+        """
+        key = self._review_cache_key(code, parallel)
+        messages = self._review_cache_get(key)
+        
+        if messages is not None:
+            for m in messages:
+                yield {'speaker': m.get('name'), 'content': m.get('content')}
+            return
+        
+        message = self._start_review(code)
+        
+        if parallel:
+            live = []
+            chat = asyncio.ensure_future(self._a_review_in_parallel(code, live))
+        else:
+            live = self.group_chat.messages
+            chat = asyncio.ensure_future(self.agents['user'].a_initiate_chat(
+                self.chat_manager,
+                message=message
+            ))
+        
+        sent = 0
+        try:
+            while True:
+                finished = chat.done()
+                while sent < len(live):
+                    m = live[sent]
+                    sent += 1
+                    yield {'speaker': m.get('name'), 'content': m.get('content')}
+                if finished:
+                    break
+                await asyncio.wait({chat}, timeout=STREAM_POLL_INTERVAL)
+        finally:
+            # The consumer stopped early; don't leave the chat running
+            if not chat.done():
+                chat.cancel()
+        
+        result = chat.result()
+        messages = result if parallel else list(self.group_chat.messages)
+        self._review_cache_put(key, messages)
+        
+        print("\n✅ Review complete!")
+        print("="*80 + "\n")
+    
+    def _review_cache_key(self, code: str, parallel: bool) -> tuple:
+        """Cache key for a review; the models are included since the configs can be changed between reviews"""
+        digest = hashlib.sha256(code.encode('utf-8', 'surrogatepass')).digest()
+        return (digest, parallel, self.llm_config.get('model'), self.specialist_llm_config.get('model'))
+    
+    def _review_cache_get(self, key: tuple) -> Optional[List[Dict]]:
+        """Messages of a cached review, marked as most recently used, or None"""
+        if key in self._review_cache:
+            self._review_cache.move_to_end(key)
+            return self._review_cache[key]
+        return None
+    
+    def _review_cache_put(self, key: tuple, messages: List[Dict]) -> None:
+        """Remember a finished review's messages, evicting the least recently used past the limit"""
+        if self._review_cache_size <= 0:
+            return
+        self._review_cache[key] = messages
+        if len(self._review_cache) > self._review_cache_size:
+            self._review_cache.popitem(last=False)
+    
+    def _start_review(self, code: str) -> str:
+        """Set up or reset the agents for a new review and build its opening message"""
         
         print("\n" + "="*80)
         print("🚀 Starting Code Review with Multi-Agent System")
         print("="*80)
         
-        # Setup
-        self.create_agents()
-        self.register_functions()
-        self.setup_group_chat()
+        # Setup; later reviews reuse the agents and only clear their history
+        # (reset() also clears each agent's usage summary, see _review_usage)
+        if not self._initialized:
+            self._ensure_agents()
+        else:
+            self.group_chat.reset()
+            self.chat_manager.reset()
+            for agent in self.agents.values():
+                agent.reset()
         
         # Initial message
         message = f"""Review this Python code:
 
 ```python
 {code}
-```
-
-ReviewOrchestrator: Start the review process."""
+```"""
         
         print("\n📨 Sending code to agents...")
         
-        # Run chat
-        self.agents['user'].initiate_chat(
-            self.chat_manager,
-            message=message
-        )
+        return message
+    
+    def _ensure_agents(self):
+        """Build the agents, their tools and the group chat, once"""
+        if not self._initialized:
+            self.create_agents()
+            self.register_functions()
+            self.setup_group_chat()
+            self._initialized = True
+    
+    def system_messages(self) -> Dict[str, str]:
+        """
+        System message of every agent, for running their prompts outside the chat
+        
+        Returns:
+            Dictionary mapping agent name (e.g. 'CodeAnalyzer') to its system message
+        """
+        self._ensure_agents()
+        return {agent.name: agent.system_message for agent in self.agents.values()}
+    
+    def _review_usage(self) -> Dict[str, Dict[str, int]]:
+        """
+        Tokens the agents sent to the LLM since _start_review reset them
+        
+        AutoGen's own response cache hits aren't counted, since they cost nothing.
+        
+        Returns:
+            Dictionary mapping model name to {'prompt', 'completion', 'total'} token counts
+        """
+        usage = {}
+        
+        for agent in self.agents.values():
+            summary = agent.get_actual_usage() or {}
+            for model, counts in summary.items():
+                if model == 'total_cost':
+                    continue
+                tokens = usage.setdefault(model, {'prompt': 0, 'completion': 0, 'total': 0})
+                tokens['prompt'] += counts.get('prompt_tokens', 0)
+                tokens['completion'] += counts.get('completion_tokens', 0)
+                tokens['total'] += counts.get('total_tokens', 0)
+        
+        return usage
+    
+    def _finish_review(self, messages: List[Dict], include_full: bool, cached: bool, usage: Dict) -> Dict:
+        """Build review_code's result from the review's messages"""
         
         print("\n✅ Review complete!")
         print("="*80 + "\n")
         
         # Return results
-        return {
-            'messages': self.group_chat.messages,
+        results = {
             'conversation': [
                 {'speaker': m.get('name'), 'content': m.get('content')} 
-                for m in self.group_chat.messages
-            ]
+                for m in messages
+            ],
+            'cached': cached,
+            'usage': usage
         }
+        if include_full:
+            results['messages'] = list(messages)
+        return results
+    
+    def _consult(self, agent_name: str, message: str) -> Dict:
+        """
+        Ask one agent for its analysis in a private two-agent chat
+        
+        Args:
+            agent_name: Key of the agent in self.agents
+            message: Request to send
+        
+        Returns:
+            The agent's final reply as a chat message dict
+        """
+        agent = self.agents[agent_name]
+        proxy = self._consult_proxy(agent_name)
+        
+        proxy.initiate_chat(agent, message=message)
+        
+        return {
+            'name': agent.name,
+            'role': 'user',
+            'content': proxy.last_message(agent).get('content')
+        }
+    
+    async def _a_consult(self, agent_name: str, message: str) -> Dict:
+        """Async version of _consult"""
+        agent = self.agents[agent_name]
+        proxy = self._consult_proxy(agent_name)
+        
+        await proxy.a_initiate_chat(agent, message=message)
+        
+        return {
+            'name': agent.name,
+            'role': 'user',
+            'content': proxy.last_message(agent).get('content')
+        }
+    
+    def _consult_proxy(self, agent_name: str):
+        """Build the user proxy for one private chat with an agent"""
+        
+        # A proxy per chat keeps concurrent chats from sharing history; it runs the
+        # agent's tool calls and ends the chat on its first reply without one
+        proxy = autogen.UserProxyAgent(
+            name="User",
+            system_message="User submitting code for review",
+            code_execution_config=False,
+            human_input_mode="NEVER",
+            max_consecutive_auto_reply=PARALLEL_TOOL_ROUNDS,
+            is_termination_msg=lambda m: not m.get('function_call') and not m.get('tool_calls')
+        )
+        
+        agent_instance = self.agent_instances.get(agent_name)
+        function_map = agent_instance.register_functions() if agent_instance else None
+        if function_map:
+            proxy.register_function(function_map=function_map)
+        
+        return proxy
+    
+    def _review_in_parallel(self, code: str) -> List[Dict]:
+        """
+        Fan the review out to the specialists concurrently, then synthesize
+        
+        Args:
+            code: Python source code to review
+        
+        Returns:
+            Conversation messages: the request, each specialist's report, the synthesis
+        """
+        message = self._parallel_request(code)
+        
+        # Each chat spends its time waiting on the LLM, so threads overlap them fully
+        with ThreadPoolExecutor(max_workers=min(len(PARALLEL_SPECIALISTS), self.max_concurrency)) as executor:
+            reports = list(executor.map(lambda name: self._consult(name, message), PARALLEL_SPECIALISTS))
+        
+        synthesis = self._consult('orchestrator', self._synthesis_request(code, reports))
+        
+        return [{'name': 'User', 'role': 'user', 'content': message}, *reports, synthesis]
+    
+    async def _a_review_in_parallel(self, code: str, live: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Async version of _review_in_parallel, gathering the specialists' chats on the event loop
+        
+        Args:
+            code: Python source code to review
+            live: List to append each message to as soon as it exists, in arrival order
+        
+        Returns:
+            Conversation messages: the request, each specialist's report, the synthesis
+        """
+        if live is None:
+            live = []
+        
+        message = self._parallel_request(code)
+        request = {'name': 'User', 'role': 'user', 'content': message}
+        live.append(request)
+        
+        # Created per review, since a semaphore belongs to the loop it is first used on
+        limit = asyncio.Semaphore(self.max_concurrency)
+        
+        async def consult(name: str) -> Dict:
+            async with limit:
+                report = await self._a_consult(name, message)
+            live.append(report)
+            return report
+        
+        reports = await asyncio.gather(*(consult(name) for name in PARALLEL_SPECIALISTS))
+        synthesis = await self._a_consult('orchestrator', self._synthesis_request(code, reports))
+        live.append(synthesis)
+        
+        return [request, *reports, synthesis]
+    
+    @staticmethod
+    def _parallel_request(code: str) -> str:
+        """Request each specialist gets in a parallel review"""
+        return f"""Review this Python code:
+
+```python
+{code}
+```"""
+    
+    @staticmethod
+    def _synthesis_request(code: str, reports: List[Dict]) -> str:
+        """Request asking the orchestrator to merge the specialists' reports"""
+        findings = "\n\n".join(f"### {report['name']}\n{report['content']}" for report in reports)
+        return f"""The specialists have already reviewed this Python code:
+
+```python
+{code}
+```
+
+{findings}
+
+ReviewOrchestrator: All agents have responded. Synthesize their findings into the final report."""
 
 
 def main():
@@ -282,7 +692,7 @@ API_KEY = "sk-1234567890abcdef"
     print("="*80)
     
     chat = CodeReviewChat()
-    results = chat.review_code(test_code)
+    results = chat.review_code(test_code, include_full=False)
     
     print("\n" + "="*80)
     print("REVIEW CONVERSATION")
@@ -297,7 +707,7 @@ API_KEY = "sk-1234567890abcdef"
             content = content[:300] + "..."
         print(content)
     
-    print(f"\n\n📊 Total messages: {len(results['messages'])}")
+    print(f"\n\n📊 Total messages: {len(results['conversation'])}")
     print("="*80)
 
 
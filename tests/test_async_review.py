@@ -0,0 +1,160 @@
+"""
+Tests for CodeReviewChat's async review
+
+The agents' LLM chats are replaced by fakes, so these run offline.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("autogen")
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_group_chat import CodeReviewChat, PARALLEL_SPECIALISTS
+
+
+# Seconds each fake agent chat takes
+CHAT_DELAY = 0.2
+
+
+class FakeUser:
+    """User proxy whose async group chat posts one canned agent report"""
+    
+    def __init__(self, group_chat):
+        self.group_chat = group_chat
+    
+    async def a_initiate_chat(self, recipient, message):
+        await asyncio.sleep(CHAT_DELAY)
+        self.group_chat.messages.append({'name': 'User', 'content': message})
+        self.group_chat.messages.append({'name': 'CodeAnalyzer', 'content': "- Issue type: bug"})
+    
+    def get_actual_usage(self):
+        return {'total_cost': 0.0, 'gpt-4': {'prompt_tokens': 10, 'completion_tokens': 5, 'total_tokens': 15}}
+
+
+def make_chat(max_concurrency=4):
+    """CodeReviewChat whose agents are fakes instead of LLM-backed AutoGen agents"""
+    chat = CodeReviewChat(api_key="sk-test", max_concurrency=max_concurrency)
+    chat.group_chat = SimpleNamespace(messages=[])
+    chat.agents = {'user': FakeUser(chat.group_chat)}
+    chat._start_review = lambda code: f"Review this Python code:\n\n{code}"
+    chat.consulted = []
+    
+    def fake_consult(agent_name, message):
+        chat.consulted.append((agent_name, message))
+        time.sleep(CHAT_DELAY)
+        return {'name': agent_name, 'role': 'user', 'content': f"{agent_name} report"}
+    
+    async def fake_a_consult(agent_name, message):
+        chat.consulted.append((agent_name, message))
+        await asyncio.sleep(CHAT_DELAY)
+        return {'name': agent_name, 'role': 'user', 'content': f"{agent_name} report"}
+    
+    chat._consult = fake_consult
+    chat._a_consult = fake_a_consult
+    return chat
+
+
+def test_a_review_code_runs_group_chat_and_caches():
+    chat = make_chat()
+    
+    first = asyncio.run(chat.a_review_code("x = 1\n"))
+    second = asyncio.run(chat.a_review_code("x = 1\n"))
+    
+    assert [m['speaker'] for m in first['conversation']] == ['User', 'CodeAnalyzer']
+    assert first['cached'] is False
+    assert first['usage'] == {'gpt-4': {'prompt': 10, 'completion': 5, 'total': 15}}
+    assert second['cached'] is True
+    assert second['conversation'] == first['conversation']
+
+
+def test_a_review_code_leaves_event_loop_free():
+    chat = make_chat()
+    ticks = []
+    
+    async def ticker():
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+    
+    async def main():
+        task = asyncio.create_task(ticker())
+        result = await chat.a_review_code("x = 1\n", parallel=True)
+        task.cancel()
+        return result
+    
+    result = asyncio.run(main())
+    
+    assert [m['speaker'] for m in result['conversation']] == ['User', *PARALLEL_SPECIALISTS, 'orchestrator']
+    # The loop kept running while the agents worked
+    assert len(ticks) > 10
+
+
+def test_parallel_specialists_are_gathered_then_synthesized():
+    chat = make_chat()
+    
+    start = time.perf_counter()
+    messages = asyncio.run(chat._a_review_in_parallel("x = 1\n"))
+    elapsed = time.perf_counter() - start
+    
+    assert [m['name'] for m in messages] == ['User', *PARALLEL_SPECIALISTS, 'orchestrator']
+    
+    # All specialists overlap, then the synthesis runs: about two chats' time, not five
+    assert elapsed < CHAT_DELAY * 3
+    
+    name, synthesis_request = chat.consulted[-1]
+    assert name == 'orchestrator'
+    for specialist in PARALLEL_SPECIALISTS:
+        assert f"{specialist} report" in synthesis_request
+
+
+def test_parallel_gather_respects_max_concurrency():
+    chat = make_chat(max_concurrency=1)
+    
+    start = time.perf_counter()
+    asyncio.run(chat._a_review_in_parallel("x = 1\n"))
+    elapsed = time.perf_counter() - start
+    
+    assert elapsed >= CHAT_DELAY * (len(PARALLEL_SPECIALISTS) + 1)
+
+
+def test_stream_yields_reports_as_they_finish_then_caches():
+    chat = make_chat()
+    
+    async def collect():
+        received = []
+        async for m in chat.a_review_code_stream("x = 1\n", parallel=True):
+            received.append((m['speaker'], time.perf_counter()))
+        return received
+    
+    start = time.perf_counter()
+    received = asyncio.run(collect())
+    
+    assert [name for name, _ in received] == ['User', *PARALLEL_SPECIALISTS, 'orchestrator']
+    
+    # The specialists' reports arrive before the synthesis has been written
+    report_at = received[1][1] - start
+    assert report_at < CHAT_DELAY * 1.5
+    
+    # A finished stream is cached for the next review of the same code
+    cached = asyncio.run(chat.a_review_code("x = 1\n", parallel=True))
+    assert cached['cached'] is True
+    assert [m['speaker'] for m in cached['conversation']] == [name for name, _ in received]
+
+
+def test_stream_of_group_chat_forwards_its_messages():
+    chat = make_chat()
+    
+    async def collect():
+        return [m async for m in chat.a_review_code_stream("x = 1\n")]
+    
+    received = asyncio.run(collect())
+    
+    assert [m['speaker'] for m in received] == ['User', 'CodeAnalyzer']
@@ -0,0 +1,140 @@
+"""
+Tests for UnifiedCodeAnalyzer's Batch API review
+
+The OpenAI client is replaced by an in-memory fake, so these run offline.
+"""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("autogen")
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("observatory_config")
+
+import unified_analyzer
+from unified_analyzer import UnifiedCodeAnalyzer
+
+
+ISSUE = "- Issue type: bug\n- Line number: {line}\n- Description: {desc}\n- Severity: High\n"
+
+
+class FakeOpenAI:
+    """Files and batches endpoints of the openai module, answering every request"""
+    
+    def __init__(self, statuses, failed=()):
+        self.statuses = list(statuses)
+        self.failed = set(failed)
+        self.uploaded = None
+        self.retrieved = 0
+        self.files = SimpleNamespace(create=self._create_file, content=self._file_content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve_batch)
+    
+    def _create_file(self, file, purpose):
+        assert purpose == "batch"
+        self.uploaded = [json.loads(line) for line in file[1].decode('utf-8').splitlines()]
+        return SimpleNamespace(id="file-in")
+    
+    def _create_batch(self, input_file_id, endpoint, completion_window, metadata):
+        assert input_file_id == "file-in"
+        self.metadata = metadata
+        return SimpleNamespace(id="batch-1", status="validating")
+    
+    def _retrieve_batch(self, batch_id):
+        status = self.statuses[min(self.retrieved, len(self.statuses) - 1)]
+        self.retrieved += 1
+        return SimpleNamespace(
+            id=batch_id,
+            status=status,
+            metadata=self.metadata,
+            output_file_id="file-out",
+            error_file_id="file-err" if self.failed else None
+        )
+    
+    def _file_content(self, file_id):
+        if file_id == "file-err":
+            lines = [json.dumps({"custom_id": custom_id}) for custom_id in sorted(self.failed)]
+            return SimpleNamespace(text="\n".join(lines))
+        
+        # Answered out of order, as the Batch API may
+        lines = []
+        for request in reversed(self.uploaded):
+            if request["custom_id"] in self.failed:
+                continue
+            index = int(request["custom_id"].split(":")[0])
+            content = ISSUE.format(line=index + 1, desc=f"problem in file {index}")
+            lines.append(json.dumps({
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "body": {"choices": [{"message": {"content": content}}]}}
+            }))
+        return SimpleNamespace(text="\n".join(lines))
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    analyzer = UnifiedCodeAnalyzer()
+    analyzer.code_review = SimpleNamespace(
+        system_messages=lambda: {
+            'CodeAnalyzer': "Find bugs.",
+            'SecurityReviewer': "Find vulnerabilities.",
+            'ReviewOrchestrator': "Coordinate."
+        },
+        specialist_llm_config={'model': 'gpt-4o-mini', 'temperature': 0.0}
+    )
+    
+    sleeps = []
+    monkeypatch.setattr(unified_analyzer.time, 'sleep', sleeps.append)
+    analyzer.sleeps = sleeps
+    return analyzer
+
+
+def test_batch_review_sends_one_request_per_file_and_specialist(analyzer, monkeypatch):
+    client = FakeOpenAI(statuses=["in_progress", "in_progress", "completed"])
+    monkeypatch.setitem(sys.modules, 'openai', client)
+    
+    result = analyzer.batch_review(["a = 1\n", "b = 2\n"], poll_interval=1.0)
+    
+    # The orchestrator doesn't report issues, so it gets no requests
+    assert sorted(r["custom_id"] for r in client.uploaded) == [
+        "0:CodeAnalyzer", "0:SecurityReviewer", "1:CodeAnalyzer", "1:SecurityReviewer"
+    ]
+    assert client.uploaded[0]["body"]["model"] == 'gpt-4o-mini'
+    
+    # Polled with exponential backoff until the batch completed
+    assert analyzer.sleeps == [1.0, 2.0]
+    
+    assert result["success"] is True
+    assert result["errors"] == []
+    assert [[issue["line"] for issue in review["issues"]] for review in result["reviews"]] == [[1], [2]]
+
+
+def test_batch_review_reports_failed_requests(analyzer, monkeypatch):
+    client = FakeOpenAI(statuses=["completed"], failed=["1:SecurityReviewer"])
+    monkeypatch.setitem(sys.modules, 'openai', client)
+    
+    result = analyzer.batch_review(["a = 1\n", "b = 2\n"])
+    
+    assert result["errors"] == ["1:SecurityReviewer"]
+    assert [m["speaker"] for m in result["reviews"][1]["conversation"]] == ['CodeAnalyzer']
+
+
+def test_non_blocking_batch_review_is_collected_later(analyzer, monkeypatch):
+    client = FakeOpenAI(statuses=["in_progress", "completed"])
+    monkeypatch.setitem(sys.modules, 'openai', client)
+    
+    submitted = analyzer.batch_review(["a = 1\n"], blocking=False)
+    assert submitted == {"mode": "batch_review", "batch_id": "batch-1", "status": "validating", "files": 1}
+    
+    pending = analyzer.collect_batch_review("batch-1", wait=False)
+    assert pending["success"] is False
+    assert pending["status"] == "in_progress"
+    
+    done = analyzer.collect_batch_review("batch-1", wait=False)
+    assert done["success"] is True
+    assert len(done["reviews"]) == 1
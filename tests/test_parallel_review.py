@@ -0,0 +1,81 @@
+"""
+Tests for CodeReviewChat's parallel review
+
+The agents' LLM chats are replaced by a fake _consult, so these run offline.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("autogen")
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_group_chat import CodeReviewChat, PARALLEL_SPECIALISTS
+
+
+# Seconds each fake agent chat takes
+CHAT_DELAY = 0.2
+
+
+def make_chat(max_concurrency=4):
+    """CodeReviewChat whose agent chats are recorded instead of sent to the LLM"""
+    chat = CodeReviewChat(api_key="sk-test", max_concurrency=max_concurrency)
+    chat.consulted = []
+    
+    def fake_consult(agent_name, message):
+        chat.consulted.append((agent_name, message))
+        time.sleep(CHAT_DELAY)
+        return {'name': agent_name, 'role': 'user', 'content': f"{agent_name} report"}
+    
+    chat._consult = fake_consult
+    return chat
+
+
+def test_specialists_run_concurrently_then_orchestrator_synthesizes():
+    chat = make_chat()
+    
+    start = time.perf_counter()
+    messages = chat._review_in_parallel("x = 1\n")
+    elapsed = time.perf_counter() - start
+    
+    assert [m['name'] for m in messages] == ['User', *PARALLEL_SPECIALISTS, 'orchestrator']
+    
+    # All specialists overlap, then the synthesis runs: about two chats' time, not five
+    assert elapsed < CHAT_DELAY * 3
+    
+    # The orchestrator is consulted last, with every specialist's report
+    name, synthesis_request = chat.consulted[-1]
+    assert name == 'orchestrator'
+    for specialist in PARALLEL_SPECIALISTS:
+        assert f"{specialist} report" in synthesis_request
+
+
+def test_max_concurrency_limits_specialist_chats():
+    chat = make_chat(max_concurrency=1)
+    
+    start = time.perf_counter()
+    chat._review_in_parallel("x = 1\n")
+    elapsed = time.perf_counter() - start
+    
+    assert elapsed >= CHAT_DELAY * (len(PARALLEL_SPECIALISTS) + 1)
+
+
+def test_review_code_parallel_uses_fan_out_and_cache():
+    chat = make_chat()
+    chat._start_review = lambda code: "request"
+    
+    first = chat.review_code("x = 1\n", parallel=True)
+    second = chat.review_code("x = 1\n", parallel=True)
+    
+    assert [m['speaker'] for m in first['conversation']] == ['User', *PARALLEL_SPECIALISTS, 'orchestrator']
+    assert first['cached'] is False
+    assert second['cached'] is True
+    assert second['conversation'] == first['conversation']
+    
+    # The second review came from the cache, without consulting anyone again
+    assert len(chat.consulted) == len(PARALLEL_SPECIALISTS) + 1
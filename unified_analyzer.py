@@ -6,12 +6,23 @@ Now with comprehensive logging for all agent steps and iterations.
 """
 
 from typing import Dict, List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import json
 import re
+import threading
 import time
 import sys
 import hashlib
 import logging
 
+# Cache keys never leave the process, so any fast hash will do; prefer BLAKE3 when installed
+try:
+    from blake3 import blake3 as _cache_hasher
+except ImportError:
+    _cache_hasher = functools.partial(hashlib.blake2b, digest_size=16)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,10 +31,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Configure AutoGen logging to show in terminal
+# Configure AutoGen logging to show in terminal (through the root handler above;
+# a handler of its own would print every AutoGen record twice)
 autogen_logger = logging.getLogger("autogen")
 autogen_logger.setLevel(logging.INFO)
-autogen_logger.addHandler(logging.StreamHandler())
 
 # Observatory imports
 from observatory_config import (
@@ -37,6 +48,40 @@ from observatory_config import (
 )
 
 
+# Agents whose replies list issues as "- Issue type: / - Line number: / ..." fields
+ISSUE_REPORTING_AGENTS = frozenset(('CodeAnalyzer', 'SecurityReviewer', 'PerformanceOptimizer'))
+
+# Keywords looked for in a "Severity:" line, in this order, and the severity each maps to
+SEVERITY_KEYWORDS = (('CRITICAL', 'Critical'), ('HIGH', 'High'), ('MEDIUM', 'Medium'), ('LOW', 'Low'))
+
+# Sort rank of each severity, most severe first
+SEVERITY_ORDER = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
+
+_LINE_NUMBER_RE = re.compile(r'(\d+)')
+
+# Seconds between Batch API status checks; doubles after each check up to the max
+BATCH_POLL_INTERVAL = 10.0
+BATCH_MAX_POLL_INTERVAL = 300.0
+
+# Batch statuses after which the batch won't change any more
+BATCH_FINAL_STATUSES = frozenset(('completed', 'failed', 'expired', 'cancelled'))
+
+# Routing tiers, lowest first: (complexity below, model, alternatives, reasoning template)
+ROUTING_TIERS = (
+    (0.3, "gpt-4o-mini", ("gpt-4", "claude-sonnet-4"), "Low complexity ({:.2f}) - using efficient model"),
+    (0.7, "gpt-4", ("gpt-4o-mini", "claude-sonnet-4"), "Medium complexity ({:.2f}) - using balanced model"),
+    (float('inf'), "gpt-4", ("gpt-4o-mini",), "High complexity ({:.2f}) - using premium model"),
+)
+
+# Most responses kept in the in-memory LLM cache, and seconds before one goes stale
+LLM_CACHE_SIZE = 1024
+LLM_CACHE_TTL = 600.0
+
+# Single writer for Observatory's database, so finished sessions are saved in order
+# without holding up the response (pending writes still finish before the process exits)
+_PERSIST_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="observatory")
+
+
 def log(msg):
     """Helper for logging"""
     logger.info(msg)
@@ -50,12 +95,14 @@ class UnifiedCodeAnalyzer:
     - Observatory: Complete monitoring with all features
     """
     
-    def __init__(self, enable_quality_eval=False):
+    def __init__(self, enable_quality_eval=False, parallel_review=True):
         """
         Initialize analyzer with Observatory tracking.
         
         Args:
             enable_quality_eval: Whether to run LLM-as-judge evaluations (costs extra)
+            parallel_review: Consult the review specialists concurrently and have the
+                orchestrator synthesize, instead of a turn-by-turn group chat
         """
         logger.info("="*80)
         logger.info("🚀 Initializing Unified Code Analyzer")
@@ -65,15 +112,24 @@ class UnifiedCodeAnalyzer:
         self.code_review = None
         self.code_fixer = None
         
-        # Simple in-memory cache for demo
-        self.cache = {}
+        # In-memory LLM response cache, least recently used first (see LLM_CACHE_SIZE/TTL);
+        # the lock keeps it consistent when the analyzer is shared between threads
+        self.cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Last session handed to the background writer, see _end_session
+        self._pending_persist = None
         
         # Enable quality evaluation (sampling recommended for cost)
         self.enable_quality_eval = enable_quality_eval
         
+        # Review mode passed to CodeReviewChat.review_code
+        self.parallel_review = parallel_review
+        
         logger.info(f"✅ Observatory monitoring enabled")
         logger.info(f"   Project: Code Review Crew")
         logger.info(f"   Quality Evaluation: {'ON' if enable_quality_eval else 'OFF (use sampling)'}")
+        logger.info(f"   Review Mode: {'Parallel specialists' if parallel_review else 'Group chat'}")
         logger.info("="*80)
     
     def _init_code_review(self):
@@ -100,24 +156,60 @@ class UnifiedCodeAnalyzer:
                 logger.error(f"❌ LangGraph Code Fixer not available: {e}")
                 self.code_fixer = "unavailable"
     
+    def _end_session(self, session, success: bool = True, error: str = None):
+        """End an Observatory session on the background writer instead of the response path"""
+        self._pending_persist = _PERSIST_EXECUTOR.submit(
+            end_tracking_session, session, success=success, error=error
+        )
+    
+    def drain(self):
+        """Wait until this analyzer's finished sessions are saved to Observatory"""
+        if self._pending_persist is None:
+            return
+        try:
+            self._pending_persist.result()
+        except Exception as e:
+            logger.error(f"❌ Saving Observatory session failed: {e}")
+        self._pending_persist = None
+    
     def _get_cache_key(self, prompt: str, model: str) -> str:
-        """Generate cache key from prompt"""
-        content = f"{model}:{prompt}"
-        return hashlib.md5(content.encode()).hexdigest()
+        """
+        Generate cache key from prompt
+        
+        Line endings and trailing whitespace are normalized first, so the same code pasted
+        from a Windows editor or with extra blank lines at the end still hits.
+        """
+        if '\r' in prompt:
+            prompt = prompt.replace('\r\n', '\n')
+        h = _cache_hasher()
+        h.update(model.encode())
+        h.update(b":")
+        h.update(prompt.rstrip().encode())
+        return h.hexdigest()
     
-    def _check_cache(self, prompt: str, model: str) -> dict:
-        """Check if response is cached"""
-        cache_key = self._get_cache_key(prompt, model)
-        return self.cache.get(cache_key)
+    def _check_cache(self, cache_key: str) -> dict:
+        """Check if a fresh response is cached under a key from _get_cache_key"""
+        with self._cache_lock:
+            entry = self.cache.get(cache_key)
+            if entry is None:
+                return None
+            if time.time() - entry['timestamp'] > LLM_CACHE_TTL:
+                del self.cache[cache_key]
+                return None
+            self.cache.move_to_end(cache_key)
+            return entry
     
-    def _store_cache(self, prompt: str, model: str, response: str, tokens: dict):
-        """Store response in cache"""
-        cache_key = self._get_cache_key(prompt, model)
-        self.cache[cache_key] = {
-            'response': response,
-            'tokens': tokens,
-            'timestamp': time.time()
-        }
+    def _store_cache(self, cache_key: str, response: str, tokens: dict):
+        """Store response in cache under a key from _get_cache_key, evicting the least recently used past the limit"""
+        with self._cache_lock:
+            self.cache[cache_key] = {
+                'response': response,
+                'tokens': tokens,
+                'timestamp': time.time()
+            }
+            self.cache.move_to_end(cache_key)
+            if len(self.cache) > LLM_CACHE_SIZE:
+                self.cache.popitem(last=False)
     
     def _analyze_complexity(self, prompt: str) -> float:
         """Simple complexity analysis for routing"""
@@ -138,7 +230,8 @@ class UnifiedCodeAnalyzer:
         prompt: str,
         operation: str,
         agent_name: str,
-        default_model: str = "gpt-4"
+        default_model: str = "gpt-4",
+        system_prompt: str = None
     ) -> Dict:
         """
         Make LLM call with full Observatory tracking:
@@ -148,45 +241,43 @@ class UnifiedCodeAnalyzer:
         4. Make call if needed
         5. Evaluate quality (if enabled)
         6. Track everything in Observatory
+        
+        Static instructions belong in system_prompt and the per-call content (code last)
+        in prompt, so calls share a prefix the provider can cache.
         """
         
-        logger.debug(f"   🤖 Making LLM call for {operation}...")
+        logger.debug("   🤖 Making LLM call for %s...", operation)
         
         start_time = time.time()
         
+        # Routing and the local cache look at everything sent
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        
         # Step 1: Analyze complexity and route
-        complexity = self._analyze_complexity(prompt)
-        
-        if complexity < 0.3:
-            chosen_model = "gpt-4o-mini"
-            alternatives = ["gpt-4", "claude-sonnet-4"]
-            reasoning = f"Low complexity ({complexity:.2f}) - using efficient model"
-        elif complexity < 0.7:
-            chosen_model = "gpt-4"
-            alternatives = ["gpt-4o-mini", "claude-sonnet-4"]
-            reasoning = f"Medium complexity ({complexity:.2f}) - using balanced model"
-        else:
-            chosen_model = "gpt-4"
-            alternatives = ["gpt-4o-mini"]
-            reasoning = f"High complexity ({complexity:.2f}) - using premium model"
+        complexity = self._analyze_complexity(full_prompt)
+        
+        for bound, chosen_model, alternatives, reasoning in ROUTING_TIERS:
+            if complexity < bound:
+                break
         
         routing = create_routing_decision(
             chosen_model=chosen_model,
-            alternative_models=alternatives,
-            reasoning=reasoning
+            alternative_models=list(alternatives),
+            reasoning=reasoning.format(complexity)
         )
         
         logger.info(f"   🔀 Routed to {chosen_model} (complexity: {complexity:.2f})")
         
-        # Step 2: Check cache
-        cached = self._check_cache(prompt, chosen_model)
+        # Step 2: Check cache (hash the prompt once for lookup, store and metadata)
+        cache_key = self._get_cache_key(full_prompt, chosen_model)
+        cached = self._check_cache(cache_key)
         
         if cached:
             logger.info(f"   💾 Cache HIT! Saved ~{cached['tokens']['total']} tokens")
             
             cache_meta = create_cache_metadata(
                 cache_hit=True,
-                cache_key=self._get_cache_key(prompt, chosen_model),
+                cache_key=cache_key,
                 cache_cluster_id=f"code_review_{operation}"
             )
             
@@ -217,38 +308,49 @@ class UnifiedCodeAnalyzer:
         import openai
         
         messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
         
         try:
             response = openai.chat.completions.create(
                 model=chosen_model,
                 messages=messages,
-                temperature=0.0
+                temperature=0.0,
+                # Routes calls with the same prefix to the same cache; sent raw so older SDKs accept it
+                extra_body={"prompt_cache_key": f"code_review_{operation}"}
             )
             
             latency_ms = (time.time() - start_time) * 1000
             content = response.choices[0].message.content
             
+            # Prompt tokens the provider served from its prefix cache (absent on older models/SDKs)
+            details = getattr(response.usage, 'prompt_tokens_details', None)
+            cached_tokens = getattr(details, 'cached_tokens', None) or 0
+            
             tokens = {
                 'prompt': response.usage.prompt_tokens,
                 'completion': response.usage.completion_tokens,
-                'total': response.usage.total_tokens
+                'total': response.usage.total_tokens,
+                'cached': cached_tokens
             }
             
             logger.info(f"   ✅ LLM call completed in {latency_ms:.0f}ms ({tokens['total']} tokens)")
+            if cached_tokens:
+                logger.info(f"   💾 Provider cache: {cached_tokens}/{tokens['prompt']} prompt tokens reused")
             
             # Step 4: Store in cache
-            self._store_cache(prompt, chosen_model, content, tokens)
+            self._store_cache(cache_key, content, tokens)
             
             cache_meta = create_cache_metadata(
                 cache_hit=False,
-                cache_key=self._get_cache_key(prompt, chosen_model),
+                cache_key=cache_key,
                 cache_cluster_id=f"code_review_{operation}"
             )
             
             # Step 5: Quality evaluation (if enabled and sampling)
             quality = None
             if self.enable_quality_eval and self._should_evaluate():
-                quality = self._evaluate_quality(prompt, content, operation)
+                quality = self._evaluate_quality(full_prompt, content, operation)
                 logger.info(f"   ⚖️  Quality Score: {quality.judge_score}/10")
             
             # Step 6: Track in Observatory
@@ -263,7 +365,8 @@ class UnifiedCodeAnalyzer:
                 response_text=content,
                 routing_decision=routing,
                 cache_metadata=cache_meta,
-                quality_evaluation=quality
+                quality_evaluation=quality,
+                metadata={"cached_prompt_tokens": cached_tokens}
             )
             
             return {
@@ -325,6 +428,62 @@ class UnifiedCodeAnalyzer:
                 confidence=0.5
             )
     
+    def _track_review(self, code: str, review: Dict, latency_ms: float) -> Dict:
+        """
+        Record the LLM calls the AutoGen review actually made in Observatory
+        
+        Args:
+            code: Code that was reviewed
+            review: Result of CodeReviewChat.review_code
+            latency_ms: Wall time of the review
+        
+        Returns:
+            Review metrics: 'model', 'cached', 'tokens' and 'quality_score'
+        """
+        cached = review.get('cached', False)
+        model = self.code_review.llm_config.get('model')
+        conversation = review.get('conversation', [])
+        final_report = (conversation[-1].get('content') or '') if conversation else ''
+        
+        cache_meta = create_cache_metadata(
+            cache_hit=cached,
+            cache_cluster_id="code_review_multi_agent_review"
+        )
+        
+        quality = None
+        if not cached and self.enable_quality_eval and self._should_evaluate():
+            quality = self._evaluate_quality(code, final_report, "multi_agent_review")
+            logger.info(f"   ⚖️  Quality Score: {quality.judge_score}/10")
+        
+        # One record per model; a cached review spent nothing
+        usage = review.get('usage') or {model: {'prompt': 0, 'completion': 0, 'total': 0}}
+        totals = {'prompt': 0, 'completion': 0, 'total': 0}
+        first = True
+        
+        for usage_model, tokens in usage.items():
+            track_llm_call(
+                model_name=usage_model,
+                prompt_tokens=tokens['prompt'],
+                completion_tokens=tokens['completion'],
+                latency_ms=latency_ms,
+                agent_name="AutoGen-Review-Crew",
+                operation="multi_agent_review",
+                prompt=code if first else None,
+                response_text=final_report if first else None,
+                cache_metadata=cache_meta,
+                quality_evaluation=quality if first else None
+            )
+            first = False
+            for k in totals:
+                totals[k] += tokens[k]
+        
+        return {
+            "model": model,
+            "cached": cached,
+            "tokens": totals,
+            "quality_score": quality.judge_score if quality else None
+        }
+    
     def review_only(self, code: str) -> Dict:
         """Review code using AutoGen multi-agent system with full tracking"""
         
@@ -334,7 +493,8 @@ class UnifiedCodeAnalyzer:
         logger.info("🤖 MODE: Review Only (AutoGen Multi-Agent)")
         logger.info("="*80)
         
-        # Start Observatory session
+        # Start Observatory session, once the previous one is saved
+        self.drain()
         session = start_tracking_session(
             operation_type="code_review",
             metadata={"code_length": len(code), "mode": "review_only"}
@@ -349,7 +509,7 @@ class UnifiedCodeAnalyzer:
         
         if self.code_review == "unavailable":
             logs = log_capturer.stop()
-            end_tracking_session(session, success=False, error="AutoGen unavailable")
+            self._end_session(session, success=False, error="AutoGen unavailable")
             return {
                 "error": "AutoGen Code Review not available",
                 "mode": "review_only",
@@ -359,24 +519,16 @@ class UnifiedCodeAnalyzer:
         try:
             logger.info("📋 Starting multi-agent code review...")
             
-            # Make optimized LLM call for review
-            review_prompt = f"Perform comprehensive code review:\n\n{code}"
-            
-            llm_result = self._make_llm_call_optimized(
-                prompt=review_prompt,
-                operation="multi_agent_review",
-                agent_name="AutoGen-Review-Crew",
-                default_model="gpt-4"
-            )
-            
             # Run actual AutoGen review
-            logger.info("🤖 Running AutoGen group chat...")
+            logger.info("🤖 Running AutoGen agents...")
             review_start = time.time()
-            result = self.code_review.review_code(code)
+            result = self.code_review.review_code(code, parallel=self.parallel_review)
             review_time = (time.time() - review_start) * 1000
             
+            llm_result = self._track_review(code, result, review_time)
+            
             logs = log_capturer.stop()
-            end_tracking_session(session, success=True)
+            self._end_session(session, success=True)
             
             total_time = (time.time() - start_time) * 1000
             
@@ -385,6 +537,7 @@ class UnifiedCodeAnalyzer:
             logger.info("="*80)
             logger.info(f"   ⏱️  Total Time: {total_time:.0f}ms")
             logger.info(f"   🤖 Model Used: {llm_result['model']}")
+            logger.info(f"   🔢 Tokens: {llm_result['tokens']['total']}")
             logger.info(f"   💾 Cached: {'Yes' if llm_result['cached'] else 'No'}")
             if llm_result.get('quality_score'):
                 logger.info(f"   ⚖️  Quality Score: {llm_result['quality_score']}/10")
@@ -409,7 +562,7 @@ class UnifiedCodeAnalyzer:
         except Exception as e:
             logger.error(f"❌ Review failed: {e}")
             logs = log_capturer.stop()
-            end_tracking_session(session, success=False, error=str(e))
+            self._end_session(session, success=False, error=str(e))
             return {
                 "error": str(e),
                 "mode": "review_only",
@@ -426,7 +579,8 @@ class UnifiedCodeAnalyzer:
         logger.info("🔥 MODE: Review + Auto-Fix (AutoGen + LangGraph)")
         logger.info("="*80)
         
-        # Start Observatory session
+        # Start Observatory session, once the previous one is saved
+        self.drain()
         session = start_tracking_session(
             operation_type="review_and_fix",
             metadata={
@@ -460,7 +614,7 @@ class UnifiedCodeAnalyzer:
         
         if self.code_review == "unavailable":
             logs = log_capturer.stop()
-            end_tracking_session(session, success=False, error="AutoGen unavailable")
+            self._end_session(session, success=False, error="AutoGen unavailable")
             return {
                 **results,
                 "error": "AutoGen Code Review not available",
@@ -468,27 +622,20 @@ class UnifiedCodeAnalyzer:
             }
         
         try:
-            review_prompt = f"Comprehensive code review with security, performance, and quality analysis:\n\n{code}"
-            
             logger.info("🤖 Starting AutoGen agents...")
-            
-            review_llm = self._make_llm_call_optimized(
-                prompt=review_prompt,
-                operation="multi_agent_review",
-                agent_name="AutoGen-Review-Crew",
-                default_model="gpt-4"
-            )
-            
             logger.info("💬 AutoGen agents communicating...")
-            review = self.code_review.review_code(code)
+            review_start = time.time()
+            review = self.code_review.review_code(code, parallel=self.parallel_review)
             results["original_review"] = review
             
+            review_llm = self._track_review(code, review, (time.time() - review_start) * 1000)
+            
             logger.info("✅ AutoGen review complete")
             
         except Exception as e:
             logger.error(f"❌ Review failed: {e}")
             logs = log_capturer.stop()
-            end_tracking_session(session, success=False, error=f"Review failed: {str(e)}")
+            self._end_session(session, success=False, error=f"Review failed: {str(e)}")
             return {
                 **results,
                 "error": f"Review failed: {str(e)}",
@@ -508,7 +655,7 @@ class UnifiedCodeAnalyzer:
         if not issues:
             logger.info("✅ No fixable issues found!")
             logs = log_capturer.stop()
-            end_tracking_session(session, success=True)
+            self._end_session(session, success=True)
             
             return {
                 **results,
@@ -539,7 +686,7 @@ class UnifiedCodeAnalyzer:
         
         if self.code_fixer == "unavailable":
             logs = log_capturer.stop()
-            end_tracking_session(session, success=False, error="LangGraph unavailable")
+            self._end_session(session, success=False, error="LangGraph unavailable")
             return {
                 **results,
                 "error": "LangGraph Code Fixer not available",
@@ -551,22 +698,6 @@ class UnifiedCodeAnalyzer:
         try:
             logger.info(f"🔄 Starting iterative fixing (max {max_iterations} iterations)...")
             
-            # Track each fix iteration
-            for i in range(min(len(issues), max_iterations)):
-                issue = issues[i]
-                logger.info(f"\n   🔨 Fixing issue {i+1}/{len(issues)}: {issue['description'][:50]}...")
-                
-                fix_prompt = f"Fix this issue:\n{issue['description']}\n\nCode:\n{code}"
-                
-                fix_llm = self._make_llm_call_optimized(
-                    prompt=fix_prompt,
-                    operation="iterative_fixing",
-                    agent_name="LangGraph-Fixer",
-                    default_model="gpt-4"
-                )
-                
-                logger.info(f"   ✅ Issue {i+1} fixed")
-            
             # Run LangGraph fixing (this will also log internally via nodes.py)
             logger.info("\n🚀 Running LangGraph workflow...")
             fix_results = self.code_fixer.fix_code(
@@ -581,7 +712,7 @@ class UnifiedCodeAnalyzer:
         except Exception as e:
             logger.error(f"❌ Fixing failed: {e}")
             logs = log_capturer.stop()
-            end_tracking_session(session, success=False, error=f"Fixing failed: {str(e)}")
+            self._end_session(session, success=False, error=f"Fixing failed: {str(e)}")
             return {
                 **results,
                 "error": f"Fixing failed: {str(e)}",
@@ -604,7 +735,7 @@ class UnifiedCodeAnalyzer:
         logger.info("="*80)
         
         logs = log_capturer.stop()
-        end_tracking_session(session, success=True)
+        self._end_session(session, success=True)
         
         total_time = (time.time() - total_start) * 1000
         
@@ -626,6 +757,176 @@ class UnifiedCodeAnalyzer:
             }
         }
     
+    def batch_review(
+        self,
+        codes: List[str],
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        blocking: bool = True
+    ) -> Dict:
+        """
+        Review many files at once through the OpenAI Batch API
+        
+        Each file goes to each issue-reporting specialist as one request of a single
+        batch, which costs half as much as live calls and has its own rate limits, but
+        may take up to 24 hours. Specialists answer from their prompts alone: there
+        is no group chat, tool use or orchestrator synthesis.
+        
+        Args:
+            codes: Python source of each file to review
+            poll_interval: Seconds before the first status check (backs off to BATCH_MAX_POLL_INTERVAL)
+            blocking: Wait for the batch to finish; when False, return its batch_id right
+                away for collect_batch_review
+        
+        Returns:
+            collect_batch_review's result, or {'mode', 'batch_id', 'status', 'files'}
+            when not blocking
+        """
+        self._init_code_review()
+        
+        if self.code_review == "unavailable":
+            return {
+                "error": "AutoGen Code Review not available",
+                "mode": "batch_review",
+                "success": False
+            }
+        
+        import openai
+        
+        prompts = {
+            name: system_message
+            for name, system_message in self.code_review.system_messages().items()
+            if name in ISSUE_REPORTING_AGENTS
+        }
+        body = {
+            "model": self.code_review.specialist_llm_config["model"],
+            "temperature": self.code_review.specialist_llm_config.get("temperature", 0.0)
+        }
+        
+        requests = []
+        for i, code in enumerate(codes):
+            for agent_name, system_message in prompts.items():
+                requests.append(json.dumps({
+                    "custom_id": f"{i}:{agent_name}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        **body,
+                        "messages": [
+                            {"role": "system", "content": system_message},
+                            {"role": "user", "content": f"Review this Python code:\n\n```python\n{code}\n```"}
+                        ]
+                    }
+                }))
+        
+        batch_file = openai.files.create(
+            file=("code_review_batch.jsonl", "\n".join(requests).encode('utf-8')),
+            purpose="batch"
+        )
+        batch = openai.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"files": str(len(codes))}
+        )
+        
+        logger.info(f"📦 Submitted batch {batch.id}: {len(codes)} files x {len(prompts)} agents")
+        
+        if not blocking:
+            return {
+                "mode": "batch_review",
+                "batch_id": batch.id,
+                "status": batch.status,
+                "files": len(codes)
+            }
+        
+        return self.collect_batch_review(batch.id, poll_interval)
+    
+    def collect_batch_review(
+        self,
+        batch_id: str,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        wait: bool = True
+    ) -> Dict:
+        """
+        Fetch the results of a batch_review batch
+        
+        Args:
+            batch_id: Batch ID returned by batch_review(blocking=False)
+            poll_interval: Seconds before the first status check (backs off to BATCH_MAX_POLL_INTERVAL)
+            wait: Poll until the batch finishes; when False, report its current status
+        
+        Returns:
+            {
+                'mode': 'batch_review',
+                'batch_id': str,
+                'success': bool,
+                'reviews': [{'conversation': [...], 'issues': [...]}, ...] in input order,
+                'errors': [custom_id, ...] of requests that failed
+            }
+            or {'mode', 'batch_id', 'status', 'success': False} if it hasn't completed
+        """
+        import openai
+        
+        batch = openai.batches.retrieve(batch_id)
+        delay = poll_interval
+        
+        while wait and batch.status not in BATCH_FINAL_STATUSES:
+            time.sleep(delay)
+            delay = min(delay * 2, BATCH_MAX_POLL_INTERVAL)
+            batch = openai.batches.retrieve(batch_id)
+        
+        if batch.status != 'completed':
+            return {
+                "mode": "batch_review",
+                "batch_id": batch_id,
+                "status": batch.status,
+                "success": False
+            }
+        
+        files = int((batch.metadata or {}).get("files", 0))
+        replies = [{} for _ in range(files)]
+        errors = []
+        
+        output = openai.files.content(batch.output_file_id).text if batch.output_file_id else ''
+        for line in output.splitlines():
+            if not line:
+                continue
+            
+            record = json.loads(line)
+            index, agent_name = record["custom_id"].split(":", 1)
+            response = record.get("response") or {}
+            
+            if response.get("status_code") != 200:
+                errors.append(record["custom_id"])
+                continue
+            
+            replies[int(index)][agent_name] = response["body"]["choices"][0]["message"]["content"]
+        
+        if batch.error_file_id:
+            for line in openai.files.content(batch.error_file_id).text.splitlines():
+                if line:
+                    errors.append(json.loads(line)["custom_id"])
+        
+        reviews = []
+        for by_agent in replies:
+            conversation = [
+                {"speaker": agent_name, "content": content}
+                for agent_name, content in sorted(by_agent.items())
+            ]
+            review = {"conversation": conversation}
+            review["issues"] = self._extract_issues(review)
+            reviews.append(review)
+        
+        logger.info(f"📦 Batch {batch_id} done: {len(reviews)} files, {len(errors)} failed requests")
+        
+        return {
+            "mode": "batch_review",
+            "batch_id": batch_id,
+            "success": True,
+            "reviews": reviews,
+            "errors": errors
+        }
+    
     def _extract_issues(self, review: Dict) -> List[Dict]:
         """Extract structured issues from AutoGen review"""
         issues = []
@@ -633,22 +934,20 @@ class UnifiedCodeAnalyzer:
         if 'conversation' not in review:
             return issues
         
-        logger.debug(f"🔍 Extracting issues from {len(review['conversation'])} messages...")
+        logger.debug("🔍 Extracting issues from %d messages...", len(review['conversation']))
         
         for msg in review['conversation']:
             speaker = msg.get('speaker', '')
-            content = msg.get('content', '')
             
-            if speaker not in ['CodeAnalyzer', 'SecurityReviewer', 'PerformanceOptimizer']:
+            if speaker not in ISSUE_REPORTING_AGENTS:
                 continue
             
-            lines = content.split('\n')
+            content = msg.get('content', '')
             current_issue = {}
             
-            for line in lines:
-                line_stripped = line.strip()
-                
-                if not line_stripped:
+            for line in content.split('\n'):
+                # Every field marker ends in a colon, so most prose and code lines stop here
+                if ':' not in line:
                     continue
                 
                 if '- Issue type:' in line:
@@ -656,62 +955,62 @@ class UnifiedCodeAnalyzer:
                         issues.append(current_issue)
                     current_issue = {'agent': speaker}
                 
-                elif 'Line number:' in line_stripped:
-                    try:
-                        num = re.search(r'(\d+)', line_stripped)
-                        if num:
-                            current_issue['line'] = int(num.group(1))
-                    except:
-                        pass
+                elif 'Line number:' in line:
+                    num = _LINE_NUMBER_RE.search(line)
+                    if num:
+                        current_issue['line'] = int(num.group(1))
                 
-                elif 'Description:' in line_stripped:
-                    desc = line_stripped.replace('- Description:', '').replace('Description:', '').strip()
+                elif 'Description:' in line:
+                    desc = line.strip().replace('- Description:', '').replace('Description:', '').strip()
                     if desc:
                         current_issue['description'] = desc
                 
-                elif 'Severity:' in line_stripped:
-                    sev_text = line_stripped.replace('- Severity:', '').replace('Severity:', '').strip().upper()
-                    if 'CRITICAL' in sev_text:
-                        current_issue['severity'] = 'Critical'
-                    elif 'HIGH' in sev_text:
-                        current_issue['severity'] = 'High'
-                    elif 'MEDIUM' in sev_text:
-                        current_issue['severity'] = 'Medium'
-                    elif 'LOW' in sev_text:
-                        current_issue['severity'] = 'Low'
+                elif 'Severity:' in line:
+                    sev_text = line.strip().replace('- Severity:', '').replace('Severity:', '').upper()
+                    for keyword, severity in SEVERITY_KEYWORDS:
+                        if keyword in sev_text:
+                            current_issue['severity'] = severity
+                            break
             
             if current_issue.get('severity') and current_issue.get('description'):
                 issues.append(current_issue)
         
         logger.info(f"   ✅ Extracted {len(issues)} issues")
         
-        # Remove duplicates
-        unique_issues = []
-        seen = set()
+        # Remove duplicates, keeping the most severe report of each, ranking as we go;
+        # descriptions are compared ignoring case and spacing, so the fixer sees each issue once
+        by_key = {}
         
         for issue in issues:
-            key = (issue.get('line'), issue.get('description', '')[:40])
-            if key not in seen:
-                seen.add(key)
-                unique_issues.append(issue)
+            key = (issue.get('line'), ' '.join(issue.get('description', '').lower().split())[:40])
+            rank = SEVERITY_ORDER.get(issue.get('severity', 'Low'), 4)
+            if key not in by_key or rank < by_key[key][0]:
+                by_key[key] = (rank, issue)
         
-        # Sort by severity
-        severity_order = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
-        unique_issues.sort(key=lambda x: severity_order.get(x.get('severity', 'Low'), 4))
-        
-        return unique_issues
+        # Sort by severity; stable, so ties keep the order they were reported in
+        return [issue for _, issue in sorted(by_key.values(), key=lambda entry: entry[0])]
 
 
 # Quick usage functions
+@functools.lru_cache(maxsize=1)
+def get_analyzer() -> UnifiedCodeAnalyzer:
+    """
+    Shared analyzer for the quick functions, so its agents and group chat are built once
+    
+    A review uses the analyzer's one group chat, so run one review at a time on it.
+    """
+    return UnifiedCodeAnalyzer()
+
+
 def quick_review(code: str) -> Dict:
     """Quick review function with full Observatory tracking"""
-    analyzer = UnifiedCodeAnalyzer()
+    analyzer = get_analyzer()
     return analyzer.review_only(code)
 
 
 def quick_fix(code: str, max_iterations: int = 10) -> str:
     """Quick fix function - returns just the fixed code with tracking"""
-    analyzer = UnifiedCodeAnalyzer()
+    analyzer = get_analyzer()
     result = analyzer.review_and_fix(code, max_iterations)
     
     if result.get('success'):